@@ -0,0 +1,275 @@
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import delete, func, select, update
+from database import AggregationJobRecord, AggregatorSessionLocal, Article, UpdateHistory
+from process_lock import create_process_lock
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+def isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() + "Z" if value else None
+
+class AggregationJob:
+    """One aggregation run and its progress, as reported by the status endpoint.
+
+    The state is mirrored to the aggregation_jobs table on every change, so
+    any worker process can report it.
+    """
+
+    def __init__(self, trigger: str):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger  # 'manual' or 'scheduler'
+        self.status = "queued"  # queued -> running -> succeeded | failed, or skipped
+        self.stage = None
+        self.progress: Dict[str, Any] = {}
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.result: Dict[str, Any] = {}
+        self.stats: Dict[str, Any] = {}
+        self.recent_updates = []
+        self.error = None
+        self.done = threading.Event()
+        self.save_lock = threading.Lock()
+
+    @classmethod
+    def from_record(cls, record: AggregationJobRecord) -> "AggregationJob":
+        """Rebuild a job, possibly run by another process, from its table row"""
+        job = cls(record.trigger)
+        job.id = record.id
+        job.status = record.status
+        job.stage = record.stage
+        job.progress = record.progress or {}
+        job.created_at = record.created_at
+        job.started_at = record.started_at
+        job.finished_at = record.finished_at
+        job.result = record.result or {}
+        job.stats = record.stats or {}
+        job.recent_updates = record.recent_updates or []
+        job.error = record.error
+        if job.status not in ACTIVE_STATUSES:
+            job.done.set()
+        return job
+
+    def set_stage(self, stage: str, **details):
+        self.stage = stage
+        self.progress.update(details)
+        try:
+            self.save()
+        except Exception as e:
+            # Progress reporting must never fail the run itself
+            logger.warning(f"Could not record progress of aggregation job {self.id}: {e}")
+
+    def save(self):
+        """Write the job's current state to its table row"""
+        with self.save_lock:
+            db = AggregatorSessionLocal()
+            try:
+                db.merge(AggregationJobRecord(
+                    id=self.id,
+                    trigger=self.trigger,
+                    status=self.status,
+                    stage=self.stage,
+                    progress=dict(self.progress),
+                    result=self.result,
+                    stats=self.stats,
+                    recent_updates=self.recent_updates,
+                    error=self.error,
+                    created_at=self.created_at,
+                    started_at=self.started_at,
+                    finished_at=self.finished_at
+                ))
+                db.commit()
+            finally:
+                db.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": dict(self.progress),
+            "created_at": isoformat(self.created_at),
+            "started_at": isoformat(self.started_at),
+            "finished_at": isoformat(self.finished_at),
+            "result": self.result,
+            "stats": self.stats,
+            "recent_updates": self.recent_updates,
+            "error": self.error
+        }
+
+class AggregationJobRunner:
+    """Runs aggregation in the background, at most one run at a time.
+
+    Manual triggers and scheduler ticks both go through submit(). A run
+    holds a lock shared with the other worker processes for its whole
+    duration. While one is in flight, in this process or another, every
+    submit returns that same job instead of starting another, so concurrent
+    triggers collapse into one run. Job state lives in the aggregation_jobs
+    table, so any worker can answer a status poll.
+    """
+
+    def __init__(self, aggregator, history_size: int = 50):
+        self.aggregator = aggregator
+        self.history_size = history_size
+        self.lock = threading.Lock()
+        self.current: Optional[AggregationJob] = None
+        self.run_lock = create_process_lock("run")
+
+    def submit(self, trigger: str = "manual") -> Tuple[AggregationJob, bool]:
+        """Start a run unless one is in flight. Returns (job, started)."""
+        with self.lock:
+            if self.current is not None:
+                return self.current, False
+
+            if not self.run_lock.acquire():
+                # Another process is running aggregation; join its job
+                job = self.find_active()
+                if job is not None:
+                    return job, False
+                # It holds the lock but has not recorded its job yet
+                job = AggregationJob(trigger)
+                job.status = "skipped"
+                job.error = "Another process is running aggregation"
+                job.finished_at = datetime.utcnow()
+                job.done.set()
+                job.save()
+                return job, False
+
+            job = AggregationJob(trigger)
+            try:
+                # Holding the run lock means no other run is alive
+                self.fail_abandoned_jobs()
+                job.save()
+                self.prune_history()
+            except Exception:
+                self.run_lock.release()
+                raise
+            self.current = job
+
+        threading.Thread(target=self.run, args=(job,), name=f"aggregation-{job.id[:8]}", daemon=True).start()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[AggregationJob]:
+        with self.lock:
+            if self.current is not None and self.current.id == job_id:
+                return self.current
+        db = AggregatorSessionLocal()
+        try:
+            record = db.get(AggregationJobRecord, job_id)
+            return AggregationJob.from_record(record) if record else None
+        finally:
+            db.close()
+
+    def find_active(self) -> Optional[AggregationJob]:
+        """The queued or running job of any process, if there is one"""
+        db = AggregatorSessionLocal()
+        try:
+            record = db.scalars(
+                select(AggregationJobRecord)
+                .where(AggregationJobRecord.status.in_(ACTIVE_STATUSES))
+                .order_by(AggregationJobRecord.created_at.desc())
+                .limit(1)
+            ).first()
+            return AggregationJob.from_record(record) if record else None
+        finally:
+            db.close()
+
+    def fail_abandoned_jobs(self):
+        """Close out jobs left active by a process that died mid-run"""
+        db = AggregatorSessionLocal()
+        try:
+            abandoned = db.execute(
+                update(AggregationJobRecord)
+                .where(AggregationJobRecord.status.in_(ACTIVE_STATUSES))
+                .values(status="failed", error="The worker running this job stopped", finished_at=datetime.utcnow())
+            ).rowcount
+            db.commit()
+            if abandoned:
+                logger.warning(f"Marked {abandoned} abandoned aggregation jobs as failed")
+        finally:
+            db.close()
+
+    def prune_history(self):
+        """Keep only the newest `history_size` jobs"""
+        db = AggregatorSessionLocal()
+        try:
+            newest = select(AggregationJobRecord.id).order_by(
+                AggregationJobRecord.created_at.desc()
+            ).limit(self.history_size).scalar_subquery()
+            db.execute(delete(AggregationJobRecord).where(AggregationJobRecord.id.not_in(newest)))
+            db.commit()
+        finally:
+            db.close()
+
+    def run(self, job: AggregationJob):
+        job.started_at = datetime.utcnow()
+        job.status = "running"
+        try:
+            job.save()
+            active_before, total_before = self.article_counts()
+            job.result = self.aggregator.aggregate_news(on_stage=job.set_stage) or {}
+            active_after, total_after = self.article_counts()
+            job.stats = {
+                "active_events_before": active_before,
+                "active_events_after": active_after,
+                "total_articles_before": total_before,
+                "total_articles_after": total_after,
+                "new_events": active_after - active_before,
+                "new_articles": total_after - total_before
+            }
+            job.recent_updates = self.recent_updates()
+            if job.result.get("status") == "failed":
+                job.status = "failed"
+                job.error = job.result.get("error")
+            else:
+                job.status = "succeeded"
+        except Exception as e:
+            logger.error(f"Aggregation job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            self.finish(job)
+
+    def finish(self, job: AggregationJob):
+        job.finished_at = datetime.utcnow()
+        try:
+            job.save()
+        except Exception as e:
+            logger.error(f"Could not record the outcome of aggregation job {job.id}: {e}")
+        finally:
+            self.run_lock.release()
+            with self.lock:
+                self.current = None
+            job.done.set()
+
+    def article_counts(self) -> Tuple[int, int]:
+        """(active, total) article counts in one query"""
+        db = AggregatorSessionLocal()
+        try:
+            active, total = db.query(
+                func.count(Article.id).filter(Article.is_active == True), func.count(Article.id)
+            ).one()
+            return active, total
+        finally:
+            db.close()
+
+    def recent_updates(self, limit: int = 5):
+        db = AggregatorSessionLocal()
+        try:
+            updates = db.query(UpdateHistory).order_by(UpdateHistory.date_time.desc()).limit(limit).all()
+            return [
+                {
+                    "dateTime": isoformat(update.date_time),
+                    "description": update.description
+                }
+                for update in updates
+            ]
+        finally:
+            db.close()
@@ -0,0 +1,92 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+# Words that carry no signal about which story an article is about
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "by", "for", "from", "has", "have", "he",
+    "her", "his", "in", "is", "it", "its", "new", "of", "on", "or", "over", "says", "she", "that",
+    "the", "their", "they", "this", "to", "after", "was", "were", "will", "with", "who", "what"
+}
+
+# MinHash signature layout: BANDS * ROWS_PER_BAND hash functions. Two items
+# become a candidate pair when any band matches, which happens with
+# probability 1 - (1 - J^ROWS_PER_BAND)^BANDS for Jaccard similarity J.
+BANDS = 16
+ROWS_PER_BAND = 2
+_MERSENNE_PRIME = (1 << 61) - 1
+_HASH_PARAMS = [
+    (1 + (i * 0x9E3779B97F4A7C15) % (_MERSENNE_PRIME - 1), (i * 0xBF58476D1CE4E5B9) % _MERSENNE_PRIME)
+    for i in range(1, BANDS * ROWS_PER_BAND + 1)
+]
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercase content words of an article's text"""
+    return {
+        word for word in re.findall(r"[a-z0-9]+", (text or "").lower())
+        if len(word) > 1 and word not in STOPWORDS
+    }
+
+def minhash_signature(tokens: Set[str]) -> List[int]:
+    """MinHash signature of a token set"""
+    hashed = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in _HASH_PARAMS]
+
+def jaccard(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+def cluster_articles(articles: List[Dict[str, Any]], threshold: float = 0.5) -> List[Dict[str, Any]]:
+    """Group near-duplicate articles and return one representative per cluster.
+    
+    Candidate pairs come from MinHash LSH over the title and description
+    words and are confirmed with their exact Jaccard similarity. The
+    representative is the member with the longest description, and it
+    carries the merged `sources` and `urls` of the whole cluster.
+    """
+    token_sets = [tokenize(f"{article.get('title', '')} {article.get('description', '')}") for article in articles]
+    
+    # Union-find over article indexes
+    parent = list(range(len(articles)))
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    buckets = defaultdict(list)
+    for index, tokens in enumerate(token_sets):
+        if not tokens:
+            continue
+        signature = minhash_signature(tokens)
+        for band in range(BANDS):
+            start = band * ROWS_PER_BAND
+            buckets[(band, tuple(signature[start:start + ROWS_PER_BAND]))].append(index)
+    
+    checked = set()
+    for members in buckets.values():
+        for position, left in enumerate(members):
+            for right in members[position + 1:]:
+                if (left, right) in checked:
+                    continue
+                checked.add((left, right))
+                if find(left) != find(right) and jaccard(token_sets[left], token_sets[right]) >= threshold:
+                    parent[find(right)] = find(left)
+    
+    clusters = defaultdict(list)
+    for index in range(len(articles)):
+        clusters[find(index)].append(index)
+    
+    representatives = []
+    # Keep the order of each cluster's first member so the prompt stays stable
+    for root in sorted(clusters, key=lambda root: clusters[root][0]):
+        members = [articles[index] for index in clusters[root]]
+        representative = dict(max(members, key=lambda article: len(article.get('description') or '')))
+        representative['sources'] = list(dict.fromkeys(article.get('source', 'Unknown') for article in members))
+        representative['urls'] = list(dict.fromkeys(article['url'] for article in members if article.get('url')))
+        # The original items, so the caller can fingerprint all of them once the story is processed
+        representative['members'] = members
+        representatives.append(representative)
+    return representatives
@@ -1,18 +1,69 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, JSON, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, ForeignKey, Float, Boolean, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, relationship
 from datetime import datetime
 import os
+import threading
 from dotenv import load_dotenv
+from db_pool import create_async_pooled_engine, create_pooled_engine
 
 # Load .env.local from parent directory
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env.prod'))
 
 # Database URL - you can set this in your .env.local file
 DATABASE_URL = os.getenv("DB_URL", "postgresql://localhost/portfolio_news")
-print(DATABASE_URL)
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# API requests and the aggregator use separate pools so a long aggregation
+# run can't starve request handling of connections (see db_pool.py).
+# Engines are created on first use, so importing this module does no work.
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(role: str = "API") -> Engine:
+    """Sync engine for a pool role (API or AGGREGATOR)"""
+    with _engines_lock:
+        if role not in _engines:
+            _engines[role] = create_pooled_engine(DATABASE_URL, role)
+        return _engines[role]
+
+def get_async_engine() -> AsyncEngine:
+    """Async engine (asyncpg) for the API endpoints, sized by the API_ settings"""
+    with _engines_lock:
+        if "API_ASYNC" not in _engines:
+            _engines["API_ASYNC"] = create_async_pooled_engine(DATABASE_URL, "API")
+        return _engines["API_ASYNC"]
+
+class APISession(Session):
+    """Session that binds to its pool's engine when it first needs a connection"""
+    engine_role = "API"
+
+    def get_bind(self, mapper=None, **kwargs):
+        return get_engine(self.engine_role)
+
+class AggregatorSession(APISession):
+    engine_role = "AGGREGATOR"
+
+class AsyncAPISession(Session):
+    """Sync half of AsyncSessionLocal sessions"""
+
+    def get_bind(self, mapper=None, **kwargs):
+        return get_async_engine().sync_engine
+
+SessionLocal = sessionmaker(class_=APISession, autocommit=False, autoflush=False)
+AggregatorSessionLocal = sessionmaker(class_=AggregatorSession, autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(sync_session_class=AsyncAPISession, expire_on_commit=False)
+
+def __getattr__(name: str):
+    # Engines used to be module attributes; keep `from database import engine` working
+    if name == "engine":
+        return get_engine("API")
+    if name == "aggregator_engine":
+        return get_engine("AGGREGATOR")
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 Base = declarative_base()
 
@@ -35,18 +86,28 @@ class Article(Base):
     event_id = Column(String, unique=True, index=True)  # Unique identifier for the event
     last_ranked_at = Column(DateTime, default=datetime.utcnow)  # When significance was last calculated
     age_penalty = Column(Float, default=0.0)  # Penalty for being old (reduces significance)
+    base_score = Column(Float)  # Significance before the age penalty; significance_score is derived from it
+    change_version = Column(Integer, index=True)  # Snapshot version of the run that last changed this event or its child rows
     
     # Relationships
     sources = relationship("Source", back_populates="article", cascade="all, delete-orphan")
     update_history = relationship("UpdateHistory", back_populates="article", cascade="all, delete-orphan")
     tags = relationship("ArticleTag", back_populates="article", cascade="all, delete-orphan")
     raw_feeds = relationship("RawFeed", back_populates="article", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Serves the front page and its keyset pagination: active events
+        # ordered by score, with the id as tie-breaker
+        Index("ix_articles_is_active_significance_score_id", "is_active", significance_score.desc(), id.desc()),
+        # Serves /api/news?since=...
+        Index("ix_articles_is_active_latest_update_datetime", "is_active", "latest_update_datetime"),
+    )
 
 class Source(Base):
     __tablename__ = "sources"
     
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"))
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
     name = Column(String, nullable=False)
     url = Column(String)
     citation = Column(String)
@@ -58,7 +119,7 @@ class UpdateHistory(Base):
     __tablename__ = "update_history"
     
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"))
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
     date_time = Column(DateTime, nullable=False)
     description = Column(Text)
     
@@ -75,12 +136,16 @@ class ArticleTag(Base):
     __tablename__ = "article_tags"
     
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"))
-    tag_id = Column(Integer, ForeignKey("tags.id"))
+    article_id = Column(Integer, ForeignKey("articles.id"))  # Indexed by the unique constraint below
+    tag_id = Column(Integer, ForeignKey("tags.id"), index=True)
     
     # Relationships
     article = relationship("Article", back_populates="tags")
     tag = relationship("Tag")
+    
+    __table_args__ = (
+        UniqueConstraint("article_id", "tag_id", name="uq_article_tags_article_id_tag_id"),
+    )
 
 class RawFeed(Base):
     """Store raw RSS and NewsAPI data for processing"""
@@ -108,8 +173,62 @@ class FeedSource(Base):
     api_key = Column(String)  # For NewsAPI
     is_active = Column(Boolean, default=True)
     last_fetched = Column(DateTime)
+    etag = Column(String)  # ETag from the last full fetch, sent back as If-None-Match
+    last_modified = Column(String)  # Last-Modified from the last full fetch, sent back as If-Modified-Since
+    poll_interval_minutes = Column(Float, default=15.0)  # Adapted to how often the feed publishes
+    next_poll_at = Column(DateTime, index=True)  # Feed is polled once this time has passed
+    latest_item_at = Column(DateTime)  # Newest item publication time seen so far
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class SeenItem(Base):
+    """Fingerprint of an ingested feed item, used to skip items already sent to the LLM"""
+    __tablename__ = "seen_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    url_hash = Column(String(64), unique=True, nullable=False, index=True)  # SHA-256 of the normalized URL
+    content_hash = Column(String(64), nullable=False)  # SHA-256 of the normalized title and summary
+    first_seen_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class AggregationJobRecord(Base):
+    """Status of an aggregation run, shared by every worker process"""
+    __tablename__ = "aggregation_jobs"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    trigger = Column(String, nullable=False)  # 'manual' or 'scheduler'
+    status = Column(String, nullable=False, index=True)  # queued, running, succeeded, failed or skipped
+    stage = Column(String)
+    progress = Column(JSON)
+    result = Column(JSON)
+    stats = Column(JSON)
+    recent_updates = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class LLMResponseCache(Base):
+    """Raw LLM responses keyed by prompt hash, reused while the prompt is unchanged"""
+    __tablename__ = "llm_response_cache"
+    
+    prompt_hash = Column(String(64), primary_key=True)  # SHA-256 of provider, model and normalized prompt
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)  # Entries expire a fixed time after this
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)  # For LRU eviction
+
+class FrontPageSnapshot(Base):
+    """Pre-rendered /api/news document, rewritten at the end of each aggregation run"""
+    __tablename__ = "front_page_snapshot"
+    
+    id = Column(Integer, primary_key=True)  # Always FRONT_PAGE_SNAPSHOT_ID
+    version = Column(Integer, nullable=False, default=0)
+    payload = Column(Text, nullable=False)  # Serialized JSON response body
+    generated_at = Column(DateTime, default=datetime.utcnow)
+
+FRONT_PAGE_SNAPSHOT_ID = 1
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -118,6 +237,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Create all tables
 def create_tables():
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=get_engine()) 
\ No newline at end of file
@@ -0,0 +1,136 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+class PoolMetrics:
+    """Checkout counters for one connection pool"""
+
+    def __init__(self, recent: int = 1000):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=recent)
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.recent_waits.append(wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            recent = sorted(self.recent_waits)
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "avg_checkout_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else None,
+                "p95_checkout_ms": round(recent[math.ceil(len(recent) * 0.95) - 1] * 1000, 2) if recent else None,
+                "max_checkout_ms": round(self.max_wait * 1000, 2)
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including waits for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            logger.warning(f"Timed out waiting for a database connection: {self.status()}")
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Keep the counters when the pool is rebuilt (e.g. after a disconnect)
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Checkout-timing pool for async engines"""
+
+def pool_setting(role: str, name: str, default: str) -> str:
+    """Read {ROLE}_DB_{NAME}, falling back to DB_{NAME} and then the default"""
+    return os.getenv(f"{role}_DB_{name}", os.getenv(f"DB_{name}", default))
+
+def pool_options(role: str) -> Dict[str, Any]:
+    return {
+        "pool_size": int(pool_setting(role, "POOL_SIZE", "5")),
+        "max_overflow": int(pool_setting(role, "MAX_OVERFLOW", "10")),
+        "pool_timeout": float(pool_setting(role, "POOL_TIMEOUT", "30")),
+        "pool_recycle": int(pool_setting(role, "POOL_RECYCLE", "1800")),
+        "pool_pre_ping": pool_setting(role, "POOL_PRE_PING", "true").lower() == "true"
+    }
+
+def create_pooled_engine(url: str, role: str) -> Engine:
+    """Build an engine with its own instrumented pool, configured from the environment.
+
+    `role` is API or AGGREGATOR, so each can be sized separately, e.g.
+    API_DB_POOL_SIZE, with DB_POOL_SIZE as the shared default.
+    """
+    connect_args = {}
+    statement_timeout_ms = int(pool_setting(role, "STATEMENT_TIMEOUT_MS", "30000"))
+    if url.startswith("postgresql") and statement_timeout_ms > 0:
+        # Enforced by the server, so a runaway query is cancelled even if the client hangs
+        connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
+    return create_engine(url, poolclass=InstrumentedQueuePool, connect_args=connect_args, **pool_options(role))
+
+def async_database_url(url: str) -> str:
+    """Switch a sync database URL to its async driver (asyncpg, or aiosqlite for SQLite)"""
+    scheme, rest = url.split("://", 1)
+    if scheme.split("+")[0] in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+def create_async_pooled_engine(url: str, role: str) -> AsyncEngine:
+    """Async counterpart of create_pooled_engine, reading the same settings"""
+    url = async_database_url(url)
+    connect_args = {}
+    statement_timeout_ms = int(pool_setting(role, "STATEMENT_TIMEOUT_MS", "30000"))
+    if url.startswith("postgresql") and statement_timeout_ms > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+
+    return create_async_engine(url, poolclass=InstrumentedAsyncQueuePool, connect_args=connect_args, **pool_options(role))
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Current occupancy and checkout timings of an engine's pool"""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    pool = engine.pool
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    status = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Share of the pool's maximum connections currently in use
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else None
+    }
+    status.update(pool.metrics.snapshot())
+    return status
@@ -0,0 +1,95 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+
+class LLMEvent(BaseModel):
+    """An event as returned by the LLM"""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    event_id: str
+    title: str
+    description: str = ""
+    significance_score: float = 0.0
+    tags: List[str] = []
+    sources: List[str] = []
+    urls: List[str] = []
+    is_update: bool = False
+    update_description: Optional[str] = None
+    changes_significant: bool = True
+
+    @field_validator("event_id", "title")
+    @classmethod
+    def not_blank(cls, value: str) -> str:
+        if not value:
+            raise ValueError("must not be empty")
+        return value
+
+    @field_validator("description", mode="before")
+    @classmethod
+    def none_to_empty(cls, value: Any) -> Any:
+        return "" if value is None else value
+
+    @field_validator("significance_score")
+    @classmethod
+    def clamp_score(cls, value: float) -> float:
+        return min(max(value, 0.0), 100.0)
+
+    @field_validator("tags", "sources", "urls", mode="before")
+    @classmethod
+    def to_string_list(cls, value: Any) -> Any:
+        # Models sometimes answer with a comma-separated string or null
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        if isinstance(value, list):
+            return [str(item).strip() for item in value if item is not None and str(item).strip()]
+        return value
+
+def validate_event(raw: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one parsed event. Returns (event, None) or (None, reason)."""
+    if not isinstance(raw, dict):
+        return None, f"expected an object, got {type(raw).__name__}"
+    try:
+        return LLMEvent.model_validate(raw).model_dump(), None
+    except ValidationError as e:
+        reasons = "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+        return None, reasons
+
+class ParseMetrics:
+    """Counters showing how much of each LLM response was usable"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.clean_calls = 0  # Every event valid and the array complete
+        self.salvaged_calls = 0  # Some events rejected or truncated, but at least one kept
+        self.wasted_calls = 0  # Nothing usable came back
+        self.events_accepted = 0
+        self.events_rejected = 0
+
+    def record_call(self, accepted: int, rejected: int, complete: bool):
+        with self.lock:
+            self.calls += 1
+            self.events_accepted += accepted
+            self.events_rejected += rejected
+            if accepted == 0:
+                self.wasted_calls += 1
+            elif rejected or not complete:
+                self.salvaged_calls += 1
+            else:
+                self.clean_calls += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            damaged = self.salvaged_calls + self.wasted_calls
+            return {
+                "llm_calls": self.calls,
+                "clean_calls": self.clean_calls,
+                "salvaged_calls": self.salvaged_calls,
+                "wasted_calls": self.wasted_calls,
+                "events_accepted": self.events_accepted,
+                "events_rejected": self.events_rejected,
+                # Share of calls with a damaged response that still produced events
+                "salvage_rate": round(self.salvaged_calls / damaged, 3) if damaged else None
+            }
@@ -0,0 +1,227 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import event, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, subqueryload
+from database import Article, ArticleTag, FrontPageSnapshot, Tag, FRONT_PAGE_SNAPSHOT_ID
+
+# Fields of an /api/news event, in response order. Each reads only the
+# relationship it needs, so a request for some fields can skip loading the rest.
+ARTICLE_FIELDS = {
+    "title": lambda article: article.title,
+    "imageUrl": lambda article: article.image_url,
+    "sources": lambda article: [
+        {
+            "name": source.name,
+            "url": source.url,
+            "citation": source.citation
+        }
+        for source in article.sources
+    ],
+    "url": lambda article: article.url,
+    "latestUpdateDateTime": lambda article: article.latest_update_datetime.isoformat() + "Z",
+    "updateHistory": lambda article: [
+        {
+            "dateTime": update.date_time.isoformat() + "Z",
+            "description": update.description
+        }
+        for update in article.update_history
+    ],
+    "description": lambda article: article.description,
+    "tags": lambda article: [article_tag.tag.name for article_tag in article.tags if article_tag.tag],
+    "significanceScore": lambda article: article.significance_score,
+    "eventId": lambda article: article.event_id
+}
+
+def serialize_article(article: Article, fields: Sequence[str] = tuple(ARTICLE_FIELDS)) -> dict:
+    """Format an eager-loaded article for the /api/news payload"""
+    return {name: ARTICLE_FIELDS[name](article) for name in fields}
+
+def build_news_payload(db: Session) -> dict:
+    """Build the /api/news payload from the ORM models"""
+    # Query only active articles, sorted by significance score (highest first).
+    # Each relationship is loaded with a single query against the same filtered
+    # subquery, so the number of round trips stays fixed no matter how many
+    # events or tags there are.
+    articles = db.query(Article).options(
+        subqueryload(Article.sources),
+        subqueryload(Article.update_history),
+        subqueryload(Article.tags).joinedload(ArticleTag.tag)
+    ).filter(
+        Article.is_active == True
+    ).order_by(Article.significance_score.desc(), Article.id.desc()).all()
+    
+    return {"articles": [serialize_article(article) for article in articles]}
+
+def change_version(db: Session) -> int:
+    """Change version of the rows this transaction writes.
+    
+    It is the version the transaction's front page snapshot will get. The
+    first call locks the snapshot row until commit, so versions are handed
+    out in commit order and clients polling /api/news/changes never skip one.
+    Call it outside any savepoint, since rolling one back can drop the lock.
+    """
+    if "change_version" not in db.info:
+        snapshot = db.get(FrontPageSnapshot, FRONT_PAGE_SNAPSHOT_ID, with_for_update=True)
+        db.info["change_version"] = (snapshot.version or 0) + 1 if snapshot else 1
+    return db.info["change_version"]
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_change_version(session: Session, transaction):
+    # A version belongs to one outermost transaction, not to its savepoints
+    if transaction.parent is None:
+        session.info.pop("change_version", None)
+
+def write_front_page_snapshot(db: Session) -> FrontPageSnapshot:
+    """Render the ranked active events into the snapshot row.
+    
+    Runs inside the caller's transaction, so the snapshot becomes visible in
+    the same commit as the changes it reflects.
+    """
+    # The session does not autoflush, so push pending writes before reading
+    db.flush()
+    payload = json.dumps(build_news_payload(db))
+    version = change_version(db)
+    
+    snapshot = db.get(FrontPageSnapshot, FRONT_PAGE_SNAPSHOT_ID, with_for_update=True)
+    if snapshot is None:
+        snapshot = FrontPageSnapshot(id=FRONT_PAGE_SNAPSHOT_ID, version=0)
+        db.add(snapshot)
+    snapshot.version = version
+    snapshot.payload = payload
+    snapshot.generated_at = datetime.utcnow()
+    return snapshot
+
+async def read_front_page_version_async(db: AsyncSession) -> Optional[int]:
+    """Version of the current snapshot, used by API workers to revalidate their cache"""
+    return await db.scalar(
+        select(FrontPageSnapshot.version).where(FrontPageSnapshot.id == FRONT_PAGE_SNAPSHOT_ID)
+    )
+
+async def read_front_page_snapshot_async(db: AsyncSession) -> Optional[str]:
+    """Fetch the pre-rendered payload with a single primary-key read"""
+    return await db.scalar(
+        select(FrontPageSnapshot.payload).where(FrontPageSnapshot.id == FRONT_PAGE_SNAPSHOT_ID)
+    )
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Turn a comma-separated `fields` parameter into field names in response order"""
+    if not fields:
+        return list(ARTICLE_FIELDS)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - ARTICLE_FIELDS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in ARTICLE_FIELDS if name in requested]
+
+def load_fields(query, fields: Sequence[str]):
+    """Eager-load only the relationships the requested fields read.
+    
+    selectinload fetches them by primary key for just the selected events.
+    """
+    if "sources" in fields:
+        query = query.options(selectinload(Article.sources))
+    if "updateHistory" in fields:
+        query = query.options(selectinload(Article.update_history))
+    if "tags" in fields:
+        query = query.options(selectinload(Article.tags).joinedload(ArticleTag.tag))
+    return query
+
+def encode_cursor(article: Article) -> str:
+    """Opaque cursor pointing just past `article` in (significance_score, id) order"""
+    key = json.dumps([article.significance_score, article.id])
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(score), int(article_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+async def query_news_page(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    min_score: Optional[float] = None,
+    since: Optional[datetime] = None,
+    fields: Sequence[str] = tuple(ARTICLE_FIELDS)
+) -> dict:
+    """One page of active events, highest significance first.
+    
+    Pages are keyset-paginated on (significance_score, id), which the
+    ix_articles_is_active_significance_score_id index returns in order, so a
+    deep page costs the same as the first. Raises ValueError on a bad cursor.
+    """
+    query = select(Article).where(Article.is_active == True)
+    if min_score is not None:
+        query = query.where(Article.significance_score >= min_score)
+    if since is not None:
+        if since.tzinfo is not None:
+            # Timestamps are stored as naive UTC
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        query = query.where(Article.latest_update_datetime >= since)
+    if tag:
+        query = query.where(Article.tags.any(ArticleTag.tag.has(Tag.name == tag)))
+    if cursor:
+        query = query.where(
+            tuple_(Article.significance_score, Article.id) < tuple_(*decode_cursor(cursor))
+        )
+    
+    # Fetch one extra row to learn whether there is a next page
+    articles = (await db.scalars(
+        load_fields(query, fields).order_by(Article.significance_score.desc(), Article.id.desc()).limit(limit + 1)
+    )).all()
+    has_more = len(articles) > limit
+    articles = articles[:limit]
+    
+    return {
+        "articles": [serialize_article(article, fields) for article in articles],
+        "nextCursor": encode_cursor(articles[-1]) if has_more else None
+    }
+
+async def read_news_changes_async(
+    db: AsyncSession,
+    since: int,
+    fields: Sequence[str] = tuple(ARTICLE_FIELDS)
+) -> dict:
+    """Events created, updated or removed after snapshot version `since`.
+    
+    Every aggregation run stamps the events it touches with the version its
+    snapshot gets (see change_version). since=0, or a version ahead of the
+    current one (e.g. after a database rebuild), returns all active events
+    with `full` set, so the client replaces its state instead of merging.
+    """
+    version = await read_front_page_version_async(db) or 0
+    full = since <= 0 or since > version
+    
+    query = select(Article).where(Article.is_active == True)
+    if not full:
+        if since == version:
+            return {"version": version, "full": False, "changed": [], "removed": []}
+        # Rows of a run that committed after the version was read are left for the next poll
+        query = query.where(Article.change_version > since, Article.change_version <= version)
+    changed = (await db.scalars(
+        load_fields(query, fields).order_by(Article.significance_score.desc(), Article.id.desc())
+    )).all()
+    
+    removed = []
+    if not full:
+        removed = (await db.scalars(
+            select(Article.event_id).where(
+                Article.is_active == False,
+                Article.change_version > since,
+                Article.change_version <= version
+            )
+        )).all()
+    
+    return {
+        "version": version,
+        "full": full,
+        "changed": [serialize_article(article, fields) for article in changed],
+        "removed": list(removed)
+    }
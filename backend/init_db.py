@@ -1,6 +1,6 @@
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from database import create_tables, SessionLocal, Article, Source, UpdateHistory, Tag, ArticleTag
+from database import SessionLocal, Article, Source, UpdateHistory, Tag, ArticleTag
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -40,6 +40,12 @@ def create_database():
     except Exception as e:
         print(f"Error creating database: {e}")
 
+def upgrade_schema():
+    """Create or upgrade the tables by running the Alembic migrations"""
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(os.path.join(os.path.dirname(__file__), 'alembic.ini')), "head")
+
 def populate_test_data():
     """Populate the database with test articles"""
     db = SessionLocal()
@@ -244,5 +250,5 @@ if __name__ == "__main__":
     # print("Creating database...")
     # create_database()
     print("Creating tables...")
-    create_tables()
+    upgrade_schema()
     print("Database setup complete!") 
\ No newline at end of file
@@ -0,0 +1,74 @@
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+class JSONArrayStream:
+    """Incrementally pull objects out of a streamed JSON array.
+
+    Text is fed in chunks as it arrives. Each top-level object in the first
+    array is yielded as soon as its closing brace is seen, so a truncated
+    response still gives up every object that finished before the cut.
+    Anything before the opening '[' (prose, code fences) is ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.complete = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.object_chars = []
+        # (error, text) for every object that was complete but not valid JSON
+        self.malformed = []
+
+    def feed(self, chunk: str) -> Iterator[Dict[str, Any]]:
+        for char in chunk:
+            if self.complete:
+                return
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                    self.depth = 1
+                continue
+
+            if self.depth >= 2:
+                self.object_chars.append(char)
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 1 and char == '{':
+                    self.object_chars = [char]
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 1 and char == '}':
+                    yield from self._emit()
+                elif self.depth == 0:
+                    self.complete = True
+
+    def _emit(self) -> Iterator[Dict[str, Any]]:
+        text = "".join(self.object_chars)
+        self.object_chars = []
+        try:
+            yield json.loads(text)
+        except json.JSONDecodeError as e:
+            self.malformed.append((str(e), text))
+            logger.warning(f"Skipping malformed event in LLM response: {e}: {text[:200]}")
+
+def iter_json_array(chunks: Iterable[str], stream: JSONArrayStream = None) -> Iterator[Dict[str, Any]]:
+    """Yield each object of the first JSON array in a stream of text chunks"""
+    stream = stream or JSONArrayStream()
+    for chunk in chunks:
+        yield from stream.feed(chunk)
@@ -0,0 +1,66 @@
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+from database import AggregatorSessionLocal, LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+def prompt_cache_key(prompt: str, provider: str, model: str) -> str:
+    """Hash of the whitespace-normalized prompt plus the provider and model"""
+    normalized = re.sub(r"\s+", " ", prompt).strip()
+    return hashlib.sha256(f"{provider}\n{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+def get_cached_response(prompt: str, provider: str, model: str, ttl_hours: float) -> Optional[str]:
+    """Return the stored response for this prompt if it hasn't expired"""
+    db = AggregatorSessionLocal()
+    try:
+        entry = db.get(LLMResponseCache, prompt_cache_key(prompt, provider, model))
+        if entry is None:
+            return None
+        now = datetime.utcnow()
+        if entry.created_at < now - timedelta(hours=ttl_hours):
+            return None
+        entry.last_used_at = now
+        db.commit()
+        return entry.response
+    except Exception as e:
+        logger.error(f"Error reading LLM response cache: {e}")
+        db.rollback()
+        return None
+    finally:
+        db.close()
+
+def store_response(prompt: str, provider: str, model: str, response: str, ttl_hours: float, max_entries: int):
+    """Store a response, then drop expired entries and the least recently used beyond max_entries"""
+    db = AggregatorSessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.merge(LLMResponseCache(
+            prompt_hash=prompt_cache_key(prompt, provider, model),
+            provider=provider,
+            model=model,
+            response=response,
+            created_at=now,
+            last_used_at=now
+        ))
+        db.flush()
+        
+        db.query(LLMResponseCache).filter(
+            LLMResponseCache.created_at < now - timedelta(hours=ttl_hours)
+        ).delete(synchronize_session=False)
+        
+        keep = db.query(LLMResponseCache.prompt_hash).order_by(
+            LLMResponseCache.last_used_at.desc()
+        ).limit(max_entries).subquery()
+        db.query(LLMResponseCache).filter(
+            LLMResponseCache.prompt_hash.notin_(keep.select())
+        ).delete(synchronize_session=False)
+        
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error writing LLM response cache: {e}")
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+class LLMProviderError(Exception):
+    """Raised when an LLM call fails, times out or is refused by the circuit breaker"""
+
+class LLMProvider(ABC):
+    """Interface for LLM backends: turn a prompt into the raw completion text"""
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @abstractmethod
+    def complete(self, prompt: str, timeout: float) -> str:
+        ...
+
+    def stream(self, prompt: str, timeout: float) -> Iterator[str]:
+        """Yield the completion in chunks as it is generated"""
+        yield self.complete(prompt, timeout)
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    def __init__(self, model: str = "gpt-4", api_key: str = None, json_mode: bool = False):
+        super().__init__(model)
+        import openai
+        # Retries are handled by ResilientLLMClient
+        self.client = openai.OpenAI(api_key=api_key, max_retries=0)
+        # JSON mode needs a model that supports response_format (gpt-4o, gpt-4-turbo, ...)
+        self.extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
+
+    def complete(self, prompt: str, timeout: float) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=2000,
+            timeout=timeout,
+            **self.extra_args
+        )
+        return response.choices[0].message.content
+
+    def stream(self, prompt: str, timeout: float) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=2000,
+            timeout=timeout,
+            stream=True,
+            **self.extra_args
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self, model: str = "gemini-1.5-flash", api_key: str = None):
+        super().__init__(model)
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        # Ask for a bare JSON document instead of prose or code fences
+        self.client = genai.GenerativeModel(model, generation_config={"response_mime_type": "application/json"})
+
+    def complete(self, prompt: str, timeout: float) -> str:
+        response = self.client.generate_content(prompt, request_options={"timeout": timeout})
+        return response.text
+
+    def stream(self, prompt: str, timeout: float) -> Iterator[str]:
+        response = self.client.generate_content(prompt, stream=True, request_options={"timeout": timeout})
+        for chunk in response:
+            yield chunk.text
+
+class FakeProvider(LLMProvider):
+    """In-process stand-in for load testing the pipeline offline.
+
+    Sleeps for `latency` seconds, fails with probability `failure_rate` and
+    otherwise answers with one event per article in the prompt. Event ids
+    and scores are derived from the article titles, and failures come from
+    a seeded RNG, so runs are repeatable.
+    """
+    name = "fake"
+
+    def __init__(self, model: str = "fake", latency: float = 0.5, failure_rate: float = 0.0, seed: int = 0):
+        super().__init__(model)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def complete(self, prompt: str, timeout: float) -> str:
+        with self.lock:
+            fail = self.random.random() < self.failure_rate
+        time.sleep(self.latency)
+        if fail:
+            raise LLMProviderError("Fake provider failure")
+        return self.render_events(prompt)
+
+    def stream(self, prompt: str, timeout: float) -> Iterator[str]:
+        with self.lock:
+            fail = self.random.random() < self.failure_rate
+        if fail:
+            time.sleep(self.latency)
+            raise LLMProviderError("Fake provider failure")
+        # Spread the latency over the chunks like a real token stream
+        content = self.render_events(prompt)
+        chunks = [content[i:i + 64] for i in range(0, len(content), 64)] or [content]
+        for chunk in chunks:
+            time.sleep(self.latency / len(chunks))
+            yield chunk
+
+    def render_events(self, prompt: str) -> str:
+        events = []
+        articles_text = prompt.split("New Articles:", 1)[-1]
+        for title, sources in re.findall(r"^\s*\d+\. (.+)\n(?:.*\n)*?\s*Sources: (.*)$", articles_text, re.MULTILINE):
+            digest = hashlib.md5(title.encode("utf-8")).hexdigest()
+            events.append({
+                "event_id": digest,
+                "title": title,
+                "description": title,
+                "significance_score": int(digest[:2], 16) % 101,
+                "tags": [],
+                "sources": [source.strip() for source in sources.split(",") if source.strip()],
+                "urls": [],
+                "is_update": False,
+                "changes_significant": True
+            })
+        return json.dumps(events)
+
+class CircuitBreaker:
+    """Stops calling an unhealthy provider for a while.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    refuses calls for `reset_timeout` seconds. It then lets a single trial
+    call through (half-open): success closes it again, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"LLM circuit breaker opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+class ResilientLLMClient:
+    """Wraps a provider with a hard per-call timeout, jittered retries and a circuit breaker"""
+
+    def __init__(self, provider: LLMProvider, timeout: float = 60, max_retries: int = 2,
+                 retry_base_delay: float = 1.0, breaker: CircuitBreaker = None, max_concurrency: int = 4):
+        self.provider = provider
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.breaker = breaker or CircuitBreaker()
+        # Calls run on their own threads so a hung SDK call can't block the caller
+        # past the timeout, even if the SDK ignores its own timeout setting
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-call")
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    @property
+    def model(self) -> str:
+        return self.provider.model
+
+    def complete(self, prompt: str) -> str:
+        """Call the provider, retrying with full-jitter exponential backoff"""
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow_request():
+                raise LLMProviderError(f"Circuit breaker is {self.breaker.state}; skipping {self.name} call")
+
+            future = self.executor.submit(self.provider.complete, prompt, self.timeout)
+            try:
+                content = future.result(timeout=self.timeout)
+                self.breaker.record_success()
+                return content
+            except FutureTimeoutError:
+                last_error = LLMProviderError(f"{self.name} call timed out after {self.timeout}s")
+            except Exception as e:
+                last_error = e
+
+            self.breaker.record_failure()
+            logger.warning(f"LLM call attempt {attempt + 1} failed: {last_error}")
+            if attempt < self.max_retries:
+                time.sleep(random.uniform(0, self.retry_base_delay * (2 ** attempt)))
+
+        raise LLMProviderError(f"{self.name} call failed after {self.max_retries + 1} attempts: {last_error}")
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Stream the completion, retrying until the first chunk arrives.
+        
+        The timeout bounds the wait for each chunk. Once output has started a
+        failure can't be retried transparently, so it is raised to the caller,
+        which keeps whatever it already consumed.
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow_request():
+                raise LLMProviderError(f"Circuit breaker is {self.breaker.state}; skipping {self.name} call")
+
+            chunks = queue.Queue()
+            done = object()
+            def produce():
+                try:
+                    for chunk in self.provider.stream(prompt, self.timeout):
+                        chunks.put(chunk)
+                    chunks.put(done)
+                except Exception as e:
+                    chunks.put(e)
+            self.executor.submit(produce)
+
+            started = False
+            try:
+                while True:
+                    try:
+                        item = chunks.get(timeout=self.timeout)
+                    except queue.Empty:
+                        raise LLMProviderError(f"{self.name} stream stalled for {self.timeout}s")
+                    if item is done:
+                        self.breaker.record_success()
+                        return
+                    if isinstance(item, Exception):
+                        raise item
+                    started = True
+                    yield item
+            except Exception as e:
+                last_error = e
+                self.breaker.record_failure()
+                if started:
+                    raise LLMProviderError(f"{self.name} stream interrupted: {e}") from e
+
+            logger.warning(f"LLM call attempt {attempt + 1} failed: {last_error}")
+            if attempt < self.max_retries:
+                time.sleep(random.uniform(0, self.retry_base_delay * (2 ** attempt)))
+
+        raise LLMProviderError(f"{self.name} call failed after {self.max_retries + 1} attempts: {last_error}")
+
+def create_provider(name: str) -> LLMProvider:
+    """Build the provider named by LLM_PROVIDER. SDKs are imported only when selected."""
+    if name == "openai":
+        return OpenAIProvider(
+            model=os.getenv("OPENAI_MODEL", "gpt-4"),
+            api_key=os.getenv("OPENAI_API_KEY"),
+            json_mode=os.getenv("OPENAI_JSON_MODE", "false").lower() == "true"
+        )
+    elif name == "gemini":
+        return GeminiProvider(model=os.getenv("GEMINI_MODEL", "gemini-1.5-flash"), api_key=os.getenv("GEMINI_API_KEY"))
+    elif name == "fake":
+        return FakeProvider(
+            latency=float(os.getenv("FAKE_LLM_LATENCY", 0.5)),
+            failure_rate=float(os.getenv("FAKE_LLM_FAILURE_RATE", 0.0)),
+            seed=int(os.getenv("FAKE_LLM_SEED", 0))
+        )
+    else:
+        raise ValueError(f"Unsupported LLM provider: {name}")
@@ -1,14 +1,27 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from database import get_db, Article, Source, UpdateHistory, Tag, ArticleTag
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_engine, get_engine, Article
+from db_pool import pool_status
+from front_page import (
+    build_news_payload, parse_fields, query_news_page, read_front_page_snapshot_async, read_front_page_version_async,
+    read_news_changes_async
+)
 from news_aggregator import aggregator
-from typing import List
+from news_cache import news_cache, etag_matches
+from typing import List, Optional, Tuple
 from datetime import datetime
+import json
+import os
 import threading
 
 app = FastAPI()
 
+# Page size of /api/news when it is paginated or filtered
+NEWS_PAGE_SIZE = int(os.getenv("NEWS_PAGE_SIZE", 20))
+NEWS_MAX_PAGE_SIZE = int(os.getenv("NEWS_MAX_PAGE_SIZE", 100))
+
 # Allow requests from your frontend (on localhost:3000)
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Start the news aggregator scheduler
@@ -32,98 +46,98 @@ async def shutdown_event():
     aggregator.stop_scheduler()
     print("News aggregator stopped")
 
+async def load_news_body(db: AsyncSession) -> bytes:
+    # The aggregator writes a pre-rendered snapshot in the same transaction
+    # as its changes; only fall back to the ORM before the first run
+    payload = await read_front_page_snapshot_async(db)
+    if payload is None:
+        payload = json.dumps(await db.run_sync(build_news_payload))
+    return payload.encode("utf-8")
+
+async def count_articles(db: AsyncSession) -> Tuple[int, int]:
+    """(active, total) article counts in one query"""
+    row = (await db.execute(
+        select(func.count(Article.id).filter(Article.is_active == True), func.count(Article.id))
+    )).one()
+    return row[0], row[1]
+
 @app.get("/api/news")
-def get_news(db: Session = Depends(get_db)):
-    # Query only active articles, sorted by significance score (highest first)
-    articles = db.query(Article).filter(
-        Article.is_active == True
-    ).order_by(Article.significance_score.desc()).all()
+async def get_news(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    min_score: Optional[float] = None,
+    since: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if any(param is not None for param in (limit, cursor, tag, min_score, since, fields)):
+        try:
+            return await query_news_page(
+                db,
+                limit=min(limit or NEWS_PAGE_SIZE, NEWS_MAX_PAGE_SIZE),
+                cursor=cursor,
+                tag=tag,
+                min_score=min_score,
+                since=since,
+                fields=parse_fields(fields)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
-    result_articles = []
-    for article in articles:
-        # Get sources for this article
-        sources = db.query(Source).filter(Source.article_id == article.id).all()
-        sources_data = [
-            {
-                "name": source.name,
-                "url": source.url,
-                "citation": source.citation
-            }
-            for source in sources
-        ]
-        
-        # Get update history for this article
-        update_history = db.query(UpdateHistory).filter(UpdateHistory.article_id == article.id).all()
-        update_history_data = [
-            {
-                "dateTime": update.date_time.isoformat() + "Z",
-                "description": update.description
-            }
-            for update in update_history
-        ]
-        
-        # Get tags for this article
-        article_tags = db.query(ArticleTag).filter(ArticleTag.article_id == article.id).all()
-        tags = []
-        for article_tag in article_tags:
-            tag = db.query(Tag).filter(Tag.id == article_tag.tag_id).first()
-            if tag:
-                tags.append(tag.name)
-        
-        # Format the article data
-        article_data = {
-            "title": article.title,
-            "imageUrl": article.image_url,
-            "sources": sources_data,
-            "url": article.url,
-            "latestUpdateDateTime": article.latest_update_datetime.isoformat() + "Z",
-            "updateHistory": update_history_data,
-            "description": article.description,
-            "tags": tags,
-            "significanceScore": article.significance_score,
-            "eventId": article.event_id
-        }
-        
-        result_articles.append(article_data)
-    
-    return {"articles": result_articles}
+    # The payload only changes when the aggregator commits, so it is served
+    # from the in-process cache and reloaded once per aggregation run. The
+    # run may have happened in another worker, so the snapshot version is
+    # re-checked every few seconds.
+    if news_cache.needs_revalidation():
+        news_cache.observe_version(await read_front_page_version_async(db))
+    body, etag = await news_cache.get_async(lambda: load_news_body(db))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
-@app.post("/api/aggregate")
-def trigger_aggregation(db: Session = Depends(get_db)):
-    """Manually trigger news aggregation"""
+@app.get("/api/news/changes")
+async def get_news_changes(
+    since: int = Query(..., ge=0),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Events changed or removed since a version returned by an earlier call"""
     try:
-        # Get stats before aggregation
-        active_before = db.query(Article).filter(Article.is_active == True).count()
-        total_before = db.query(Article).count()
-        
-        # Run aggregation
-        aggregator.aggregate_news()
-        
-        # Get stats after aggregation
-        active_after = db.query(Article).filter(Article.is_active == True).count()
-        total_after = db.query(Article).count()
-        
-        # Get recent updates
-        recent_updates = db.query(UpdateHistory).order_by(UpdateHistory.date_time.desc()).limit(5).all()
-        update_log = [
-            {
-                "dateTime": update.date_time.isoformat() + "Z",
-                "description": update.description
-            }
-            for update in recent_updates
-        ]
-        
-        return {
-            "message": "News aggregation completed successfully",
-            "stats": {
-                "active_events_before": active_before,
-                "active_events_after": active_after,
-                "total_articles_before": total_before,
-                "total_articles_after": total_after,
-                "new_events": active_after - active_before,
-                "new_articles": total_after - total_before
-            },
-            "recent_updates": update_log
+        return await read_news_changes_async(db, since, parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/aggregate", status_code=202)
+def trigger_aggregation():
+    """Start a background aggregation run, or join the one already in flight"""
+    job, started = aggregator.jobs.submit("manual")
+    return {
+        "message": "News aggregation started" if started else "News aggregation already in progress",
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/aggregate/{job.id}"
+    }
+
+@app.get("/api/aggregate/{job_id}")
+def get_aggregation_status(job_id: str):
+    """Stage progress and before/after stats of an aggregation run"""
+    job = aggregator.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown aggregation job")
+    return job.to_dict()
+
+@app.get("/api/stats")
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
+    """Statistics about the news aggregation system"""
+    active_articles, total_articles = await count_articles(db)
+    return {
+        "active_articles": active_articles,
+        "total_articles": total_articles,
+        "llm_parsing": aggregator.parse_metrics.snapshot(),
+        "db_pools": {
+            "api": pool_status(get_async_engine()),
+            "aggregator": pool_status(get_engine("AGGREGATOR"))
         }
-    except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+    }
@@ -7,7 +7,12 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env.local'))
 
 def migrate_database():
-    """Migrate the existing database to add new fields"""
+    """Migrate the existing database to add new fields.
+    
+    Superseded by the Alembic migrations in alembic/. Run this once on a
+    database created before them, then `alembic stamp 0001` and
+    `alembic upgrade head`.
+    """
     db = SessionLocal()
     
     try:
@@ -18,6 +23,7 @@ def migrate_database():
             "ALTER TABLE articles ADD COLUMN IF NOT EXISTS event_id VARCHAR UNIQUE",
             "ALTER TABLE articles ADD COLUMN IF NOT EXISTS last_ranked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
             "ALTER TABLE articles ADD COLUMN IF NOT EXISTS age_penalty FLOAT DEFAULT 0.0",
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS base_score FLOAT",
             
             # Create new tables
             """
@@ -43,6 +49,45 @@ def migrate_database():
                 last_fetched TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
+            """,
+            
+            "ALTER TABLE feed_sources ADD COLUMN IF NOT EXISTS etag VARCHAR",
+            "ALTER TABLE feed_sources ADD COLUMN IF NOT EXISTS last_modified VARCHAR",
+            "ALTER TABLE feed_sources ADD COLUMN IF NOT EXISTS poll_interval_minutes FLOAT DEFAULT 15.0",
+            "ALTER TABLE feed_sources ADD COLUMN IF NOT EXISTS next_poll_at TIMESTAMP",
+            "ALTER TABLE feed_sources ADD COLUMN IF NOT EXISTS latest_item_at TIMESTAMP",
+            "CREATE INDEX IF NOT EXISTS ix_feed_sources_next_poll_at ON feed_sources (next_poll_at)",
+            
+            """
+            CREATE TABLE IF NOT EXISTS seen_items (
+                id SERIAL PRIMARY KEY,
+                url_hash VARCHAR(64) NOT NULL UNIQUE,
+                content_hash VARCHAR(64) NOT NULL,
+                first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_seen_items_last_seen_at ON seen_items (last_seen_at)",
+            
+            """
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                prompt_hash VARCHAR(64) PRIMARY KEY,
+                provider VARCHAR NOT NULL,
+                model VARCHAR NOT NULL,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_used_at ON llm_response_cache (last_used_at)",
+            
+            """
+            CREATE TABLE IF NOT EXISTS front_page_snapshot (
+                id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL,
+                generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
             """
         ]
         
@@ -59,6 +104,7 @@ def migrate_database():
         # Update existing articles with default values
         db.execute(text("UPDATE articles SET is_active = TRUE WHERE is_active IS NULL"))
         db.execute(text("UPDATE articles SET significance_score = 50.0 WHERE significance_score IS NULL"))
+        db.execute(text("UPDATE articles SET base_score = significance_score + COALESCE(age_penalty, 0) WHERE base_score IS NULL"))
         
         # Generate event IDs for existing articles
         articles = db.execute(text("SELECT id, title, description FROM articles WHERE event_id IS NULL")).fetchall()
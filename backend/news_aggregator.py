@@ -1,16 +1,25 @@
-import feedparser
-from newsapi import NewsApiClient
-import openai
-import google.generativeai as genai
+import requests
 import schedule
 import time
 import threading
 import hashlib
-import json
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from database import SessionLocal, Article, Source, UpdateHistory, Tag, ArticleTag, RawFeed, FeedSource
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased, subqueryload
+from database import AggregatorSessionLocal, Article, Source, UpdateHistory, Tag, ArticleTag, RawFeed, FeedSource
+from aggregation_jobs import AggregationJobRunner
+from clustering import cluster_articles
+from event_schema import ParseMetrics, validate_event
+from front_page import change_version, write_front_page_snapshot
+from json_stream import JSONArrayStream, iter_json_array
+from llm_cache import get_cached_response, store_response
+from llm_providers import CircuitBreaker, LLMProviderError, ResilientLLMClient, create_provider
+from news_cache import news_cache
+from process_lock import create_process_lock
+from seen_items import filter_unseen_articles, item_fingerprint, mark_articles_seen, prune_seen_items
+from tag_cache import add_article_tags, tag_cache
 import os
 from dotenv import load_dotenv
 import logging
@@ -26,32 +35,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+RSS_USER_AGENT = "portfolio-news-aggregator/1.0"
+
+# Seeded into feed_sources the first time the aggregator runs against an empty table
+DEFAULT_FEED_SOURCES = [
+    {"name": "BBC News", "source_type": "rss", "url": "https://feeds.bbci.co.uk/news/rss.xml"},
+    {"name": "CNN", "source_type": "rss", "url": "https://rss.cnn.com/rss/edition.rss"},
+    {"name": "Reuters", "source_type": "rss", "url": "https://feeds.reuters.com/Reuters/worldNews"},
+    {"name": "The Guardian", "source_type": "rss", "url": "https://www.theguardian.com/world/rss"},
+    {"name": "NPR", "source_type": "rss", "url": "https://feeds.npr.org/1001/rss.xml"},
+    {"name": "New York Times", "source_type": "rss", "url": "https://rss.nytimes.com/services/xml/rss/nyt/World.xml"},
+    {"name": "NewsAPI Top Headlines", "source_type": "newsapi", "url": None}
+]
+
+def parse_published_at(value: Any) -> Optional[datetime]:
+    """Convert a feedparser struct_time or NewsAPI ISO timestamp to a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+        return datetime(*value[:6])
+    except (TypeError, ValueError):
+        return None
+
 class NewsAggregator:
     def __init__(self):
-        # Configure LLM provider (can be 'openai' or 'gemini')
+        # Configure LLM provider (can be 'openai', 'gemini' or 'fake' for offline load tests)
         self.llm_provider = os.getenv("LLM_PROVIDER", "gemini").lower()
+        self.llm_batch_concurrency = int(os.getenv("LLM_BATCH_CONCURRENCY", 3))
+        # The provider SDK and the NewsAPI client are slow to import, so they
+        # are only built when the first aggregation run needs them
+        self._llm_client = None
+        self._newsapi_client = None
+        self._client_lock = threading.Lock()
         
-        # Initialize API clients based on provider
-        if self.llm_provider == "openai":
-            self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            logger.info("Using OpenAI GPT-4 for LLM processing")
-        elif self.llm_provider == "gemini":
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-            logger.info("Using Google Gemini for LLM processing")
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
-        
-        self.newsapi_client = NewsApiClient(api_key=os.getenv("NEWSAPI_KEY"))
         self.max_active_events = 12
-        self.rss_feeds = [
-            "https://feeds.bbci.co.uk/news/rss.xml",
-            "https://rss.cnn.com/rss/edition.rss",
-            "https://feeds.reuters.com/Reuters/worldNews",
-            "https://www.theguardian.com/world/rss",
-            "https://feeds.npr.org/1001/rss.xml",
-            "https://rss.nytimes.com/services/xml/rss/nyt/World.xml"
-        ]
+        
+        # Feeds are loaded from the feed_sources table. Each one is polled on
+        # its own interval, which adapts to how often it publishes.
+        self.scheduler_tick_minutes = int(os.getenv("AGGREGATION_TICK_MINUTES", 5))
+        self.default_poll_minutes = float(os.getenv("FEED_DEFAULT_POLL_MINUTES", 15))
+        self.min_poll_minutes = float(os.getenv("FEED_MIN_POLL_MINUTES", 5))
+        self.max_poll_minutes = float(os.getenv("FEED_MAX_POLL_MINUTES", 120))
+        
+        # RSS fetch concurrency and timeouts (seconds)
+        self.rss_fetch_workers = int(os.getenv("RSS_FETCH_WORKERS", 8))
+        self.rss_connect_timeout = float(os.getenv("RSS_CONNECT_TIMEOUT", 5))
+        self.rss_read_timeout = float(os.getenv("RSS_READ_TIMEOUT", 15))
+        self.rss_fetch_deadline = float(os.getenv("RSS_FETCH_DEADLINE", 45))
+        
+        # LLM batching: estimated prompt tokens per call (see llm_batch_concurrency above)
+        self.llm_batch_token_budget = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", 6000))
+        
+        # How much of each LLM response could be used (exposed on /api/stats)
+        self.parse_metrics = ParseMetrics()
+        
+        # Cache of raw LLM responses by prompt hash
+        self.llm_cache_ttl_hours = float(os.getenv("LLM_CACHE_TTL_HOURS", 6))
+        self.llm_cache_max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 500))
+        
+        # Minimum Jaccard similarity for two articles to count as the same story
+        self.cluster_similarity_threshold = float(os.getenv("CLUSTER_SIMILARITY_THRESHOLD", 0.5))
+        
+        # How long an item's fingerprint is kept after it drops out of every feed
+        self.seen_item_retention_days = int(os.getenv("SEEN_ITEM_RETENTION_DAYS", 7))
+        
+        # Streamed events are written in chunks of this size
+        self.event_write_chunk_size = int(os.getenv("EVENT_WRITE_CHUNK_SIZE", 10))
         
         # New event significance score bonus
         self.new_event_bonus = float(os.getenv("NEW_EVENT_BONUS", 25))
@@ -59,40 +110,232 @@ class NewsAggregator:
         # Scheduler control
         self.scheduler_running = False
         self.scheduler_thread = None
+        self.scheduler_stop = threading.Event()
+        
+        # Only the process holding this lock runs the schedule (see process_lock.py)
+        self.leader_lock = create_process_lock("leader")
+        self.leader_heartbeat_seconds = float(os.getenv("LEADER_HEARTBEAT_SECONDS", 30))
+        self.is_leader = False
         
+        # Background runs shared by the scheduler and /api/aggregate
+        self.jobs = AggregationJobRunner(self)
+        
+    @property
+    def llm_client(self) -> ResilientLLMClient:
+        with self._client_lock:
+            if self._llm_client is None:
+                provider = create_provider(self.llm_provider)
+                self._llm_client = ResilientLLMClient(
+                    provider,
+                    timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", 60)),
+                    max_retries=int(os.getenv("LLM_MAX_RETRIES", 2)),
+                    retry_base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0)),
+                    breaker=CircuitBreaker(
+                        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", 3)),
+                        reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", 300))
+                    ),
+                    max_concurrency=self.llm_batch_concurrency
+                )
+                logger.info(f"Using {self.llm_provider} ({provider.model}) for LLM processing")
+            return self._llm_client
+    
+    @property
+    def llm_model(self) -> str:
+        return self.llm_client.model
+    
+    @property
+    def newsapi_client(self):
+        with self._client_lock:
+            if self._newsapi_client is None:
+                from newsapi import NewsApiClient
+                self._newsapi_client = NewsApiClient(api_key=os.getenv("NEWSAPI_KEY"))
+            return self._newsapi_client
+    
     def get_db(self) -> Session:
-        return SessionLocal()
+        return AggregatorSessionLocal()
     
     def generate_event_id(self, title: str, description: str) -> str:
         """Generate a unique event ID based on content"""
         content = f"{title}:{description}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def fetch_rss_feeds(self) -> List[Dict[str, Any]]:
-        """Fetch articles from RSS feeds"""
-        articles = []
+    def ensure_default_feed_sources(self, db: Session):
+        """Seed the feed registry with the default feeds if it is empty"""
+        if db.query(FeedSource.id).first() is not None:
+            return
+        for feed in DEFAULT_FEED_SOURCES:
+            db.add(FeedSource(
+                name=feed["name"],
+                source_type=feed["source_type"],
+                url=feed["url"],
+                is_active=True,
+                poll_interval_minutes=self.default_poll_minutes
+            ))
+        db.commit()
+        logger.info(f"Seeded {len(DEFAULT_FEED_SOURCES)} default feed sources")
+    
+    def get_due_feed_sources(self, db: Session) -> List[FeedSource]:
+        """Load the active feeds whose next poll time has passed"""
+        now = datetime.utcnow()
+        return db.query(FeedSource).filter(
+            FeedSource.is_active == True,
+            (FeedSource.next_poll_at == None) | (FeedSource.next_poll_at <= now)
+        ).order_by(FeedSource.id).all()
+    
+    def schedule_next_poll(self, feed_source: FeedSource, articles: List[Dict[str, Any]], failed: bool = False):
+        """Adapt a feed's poll interval to how often it publishes.
         
-        for feed_url in self.rss_feeds:
-            try:
-                feed = feedparser.parse(feed_url)
-                logger.info(f"Fetched {len(feed.entries)} articles from {feed_url}")
-                
-                for entry in feed.entries[:10]:  # Limit to 10 articles per feed
-                    article = {
-                        'title': entry.get('title', ''),
-                        'description': entry.get('summary', ''),
-                        'url': entry.get('link', ''),
-                        'published_at': entry.get('published_parsed'),
-                        'source': feed.feed.get('title', 'Unknown'),
-                        'source_type': 'rss',
-                        'feed_url': feed_url
-                    }
-                    articles.append(article)
-                    
-            except Exception as e:
-                logger.error(f"Error fetching RSS feed {feed_url}: {e}")
-                
-        return articles
+        The interval halves when the poll turned up items newer than anything
+        seen before and grows by half when it didn't, within the configured
+        bounds. Failed polls keep the current interval.
+        """
+        now = datetime.utcnow()
+        interval = feed_source.poll_interval_minutes or self.default_poll_minutes
+        
+        if not failed:
+            published = [parse_published_at(article.get('published_at')) for article in articles]
+            published = [published_at for published_at in published if published_at]
+            if published:
+                new_items = sum(
+                    1 for published_at in published
+                    if feed_source.latest_item_at is None or published_at > feed_source.latest_item_at
+                )
+                feed_source.latest_item_at = max(published + [feed_source.latest_item_at or published[0]])
+            else:
+                # Without dates, treat any changed feed body as news
+                new_items = len(articles)
+            
+            if new_items:
+                interval = max(self.min_poll_minutes, interval / 2)
+            else:
+                interval = min(self.max_poll_minutes, interval * 1.5)
+            feed_source.last_fetched = now
+        
+        feed_source.poll_interval_minutes = interval
+        feed_source.next_poll_at = now + timedelta(minutes=interval)
+        logger.info(f"Next poll of {feed_source.name} in {interval:.1f} minutes")
+    
+    def fetch_rss_feed(self, feed_url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch and parse a single RSS feed.
+        
+        The feed's stored ETag/Last-Modified values are sent back as a
+        conditional GET; a 304 skips parsing entirely.
+        """
+        result = {
+            'feed_url': feed_url,
+            'status': 'error',
+            'articles': [],
+            'etag': etag,
+            'last_modified': last_modified
+        }
+        headers = {"User-Agent": RSS_USER_AGENT}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                feed_url,
+                timeout=(self.rss_connect_timeout, self.rss_read_timeout),
+                headers=headers
+            )
+            if response.status_code == 304:
+                logger.info(f"RSS feed {feed_url} not modified ({time.monotonic() - started:.2f}s)")
+                result['status'] = 'not_modified'
+                return result
+            response.raise_for_status()
+            import feedparser
+            feed = feedparser.parse(response.content)
+        except Exception as e:
+            logger.error(f"Error fetching RSS feed {feed_url} after {time.monotonic() - started:.2f}s: {e}")
+            return result
+        elapsed = time.monotonic() - started
+        logger.info(f"Fetched {len(feed.entries)} articles from {feed_url} in {elapsed:.2f}s")
+        
+        result['status'] = 'ok'
+        result['etag'] = response.headers.get('ETag')
+        result['last_modified'] = response.headers.get('Last-Modified')
+        for entry in feed.entries[:10]:  # Limit to 10 articles per feed
+            article = {
+                'title': entry.get('title', ''),
+                'description': entry.get('summary', ''),
+                'url': entry.get('link', ''),
+                'published_at': entry.get('published_parsed'),
+                'source': feed.feed.get('title', 'Unknown'),
+                'source_type': 'rss',
+                'feed_url': feed_url
+            }
+            result['articles'].append(article)
+        
+        return result
+    
+    def fetch_rss_feeds(self, feeds: Dict[str, Dict[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """Fetch RSS feeds concurrently and return one result per completed feed.
+        
+        Each feed gets its own connect/read timeout, and feeds still running
+        when the overall deadline passes are abandoned so the rest of the
+        cycle can go ahead with whatever arrived in time. `feeds` maps each
+        feed URL to its stored 'etag' and 'last_modified' values.
+        """
+        results = []
+        if not feeds:
+            return results
+        
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.rss_fetch_workers, len(feeds)),
+            thread_name_prefix="rss-fetch"
+        )
+        try:
+            futures = {
+                executor.submit(self.fetch_rss_feed, feed_url, **validators): feed_url
+                for feed_url, validators in feeds.items()
+            }
+            done, not_done = wait(futures, timeout=self.rss_fetch_deadline)
+            
+            # Keep results in feed order so the LLM prompt is stable between runs
+            for future in futures:
+                if future in done:
+                    results.append(future.result())
+            
+            for future in not_done:
+                logger.warning(f"RSS feed {futures[future]} missed the {self.rss_fetch_deadline}s fetch deadline")
+        finally:
+            # Don't block on stragglers; they stop at their own read timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        logger.info(f"RSS fetch stage finished in {time.monotonic() - started:.2f}s")
+        return results
+    
+    def record_rss_fetch_results(self, results: List[Dict[str, Any]], feed_sources: Dict[str, FeedSource]):
+        """Stage each feed's next poll time on its FeedSource row"""
+        for result in results:
+            feed_source = feed_sources.get(result['feed_url'])
+            if feed_source is None:
+                continue
+            self.schedule_next_poll(feed_source, result['articles'], failed=result['status'] == 'error')
+    
+    def record_rss_validators(self, results: List[Dict[str, Any]], feed_sources: Dict[str, FeedSource], unprocessed: List[Dict[str, Any]]):
+        """Stage the new ETag/Last-Modified of each feed whose items were all processed.
+        
+        A feed with items in `unprocessed` gets its validators cleared
+        instead, so the next poll fetches it in full rather than getting a
+        304 for items that never reached the LLM. Call this only on a run
+        that is about to commit.
+        """
+        unprocessed_hashes = {item_fingerprint(article)['url_hash'] for article in unprocessed}
+        for result in results:
+            feed_source = feed_sources.get(result['feed_url'])
+            if feed_source is None or result['status'] != 'ok':
+                continue
+            if any(item_fingerprint(article)['url_hash'] in unprocessed_hashes for article in result['articles']):
+                feed_source.etag = None
+                feed_source.last_modified = None
+            else:
+                feed_source.etag = result['etag']
+                feed_source.last_modified = result['last_modified']
     
     def fetch_newsapi(self) -> List[Dict[str, Any]]:
         """Fetch articles from NewsAPI"""
@@ -130,56 +373,31 @@ class NewsAggregator:
     
     def get_existing_events_for_matching(self, db: Session) -> List[Dict[str, Any]]:
         """Get existing active events for LLM to match against"""
-        existing_articles = db.query(Article).filter(Article.is_active == True).all()
+        existing_articles = db.query(Article).options(
+            subqueryload(Article.tags).joinedload(ArticleTag.tag)
+        ).filter(Article.is_active == True).all()
         
         existing_events = []
         for article in existing_articles:
-            # Get tags for this article
-            article_tags = db.query(ArticleTag).filter(ArticleTag.article_id == article.id).all()
-            tags = []
-            for article_tag in article_tags:
-                tag = db.query(Tag).filter(Tag.id == article_tag.tag_id).first()
-                if tag:
-                    tags.append(tag.name)
-            
             existing_events.append({
                 'event_id': article.event_id,
                 'title': article.title,
                 'description': article.description,
-                'tags': tags,
+                'tags': [article_tag.tag.name for article_tag in article.tags if article_tag.tag],
                 'significance_score': article.significance_score
             })
         
         return existing_events
     
-    def call_openai_llm(self, prompt: str) -> str:
-        """Call OpenAI API"""
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=2000
-        )
-        return response.choices[0].message.content
-    
-    def call_gemini_llm(self, prompt: str) -> str:
-        """Call Gemini API"""
-        response = self.gemini_model.generate_content(prompt)
-        return response.text
+    def format_article_for_prompt(self, index: int, article: Dict[str, Any]) -> str:
+        """Render one (clustered) article as a numbered prompt entry"""
+        article_text = f"{index}. {article['title']}\n"
+        article_text += f"   Description: {article['description']}\n"
+        article_text += f"   Sources: {', '.join(article.get('sources') or [article['source']])}\n\n"
+        return article_text
     
-    def process_with_llm(self, articles: List[Dict[str, Any]], existing_events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Use LLM to compile events and assign significance scores"""
-        if not articles:
-            return []
-        
-        # Prepare articles for LLM processing
-        articles_text = ""
-        for i, article in enumerate(articles[:20]):  # Limit to 20 articles for processing
-            articles_text += f"{i+1}. {article['title']}\n"
-            articles_text += f"   Description: {article['description']}\n"
-            articles_text += f"   Source: {article['source']}\n\n"
-        
-        # Prepare existing events for matching
+    def format_existing_events_for_prompt(self, existing_events: List[Dict[str, Any]]) -> str:
+        """Render the active events the LLM should match new articles against"""
         existing_events_text = ""
         if existing_events:
             existing_events_text = "\nExisting Active Events:\n"
@@ -189,284 +407,602 @@ class NewsAggregator:
                 existing_events_text += f"   Description: {event['description']}\n"
                 existing_events_text += f"   Tags: {', '.join(event['tags'])}\n"
                 existing_events_text += f"   Current Score: {event['significance_score']}\n\n"
+        return existing_events_text
+    
+    def build_llm_prompt(self, articles_text: str, existing_events_text: str) -> str:
+        """LLM prompt for event compilation and ranking"""
+        prompt = f"""
+        Analyze the following news articles and existing events:
+        
+        {existing_events_text}
+        
+        New Articles:
+        {articles_text}
+        
+        Your task:
+        1. For each new article, determine if it relates to an existing event or represents a new event
+        2. If it relates to an existing event, compare the information and determine if there are meaningful new developments
+        3. If it's a new event, generate a new event_id (use the title and description to create a unique identifier)
+        4. Compile comprehensive summaries for each event
+        5. Assign significance scores (0-100) based on:
+           - Global impact
+           - Number of people affected
+           - Economic significance
+           - Political importance
+           - Scientific/technological breakthrough
+           - Urgency/timeliness
+        
+        CRITICAL: For updates to existing events, ONLY mark as update if there are substantial new developments such as:
+        - New facts or numbers (e.g., "Death toll rises to 50", "100 people affected")
+        - New statements or accusations (e.g., "Trump blames Biden", "Company admits fault")
+        - Breaking developments (e.g., "New evidence emerges", "CEO resigns")
+        - Major changes in the story (e.g., "Investigation reveals", "Court rules against")
+        
+        DO NOT update for:
+        - Minor rephrasing with same meaning
+        - Small score adjustments without new info
+        - Duplicate information from different sources
+        - Minor editorial changes
+        
+        Return a JSON array with objects containing:
+        - event_id: existing event_id if updating, or new unique identifier if new event
+        - title: compelling headline
+        - description: comprehensive summary
+        - significance_score: 0-100
+        - tags: relevant categories
+        - sources: list of source names
+        - urls: list of article URLs
+        - is_update: true if updating existing event with meaningful new info, false if new event
+        - update_description: brief description of what changed (only for meaningful updates, max 100 chars)
+        - changes_significant: true/false - whether the changes warrant a new update record
+        
+        Respond with JSON only. If your output must be a JSON object, put the array under an "events" key.
+        """
+        return prompt
+    
+    def estimate_tokens(self, text: str) -> int:
+        """Rough token count (about four characters per token for English text)"""
+        return len(text) // 4 + 1
+    
+    def batch_articles(self, articles: List[Dict[str, Any]], existing_events_text: str) -> List[List[Dict[str, Any]]]:
+        """Split the articles into batches whose prompts fit the per-call token budget.
+        
+        Every batch repeats the instructions and existing events, so only the
+        space left over from the budget is filled with articles. A batch
+        always takes at least one article.
+        """
+        overhead = self.estimate_tokens(self.build_llm_prompt("", existing_events_text))
+        available = max(self.llm_batch_token_budget - overhead, 1)
+        
+        batches = []
+        batch, batch_tokens = [], 0
+        for article in articles:
+            article_tokens = self.estimate_tokens(self.format_article_for_prompt(len(batch) + 1, article))
+            if batch and batch_tokens + article_tokens > available:
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(article)
+            batch_tokens += article_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def heuristic_rank_events(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cheap stand-in for the LLM while the provider is unhealthy.
+        
+        Every (clustered) article becomes its own new event, scored by how
+        many outlets carried the story.
+        """
+        events = []
+        for article in articles:
+            sources = article.get('sources') or [article.get('source', 'Unknown')]
+            events.append({
+                'event_id': self.generate_event_id(article['title'], article['description']),
+                'title': article['title'],
+                'description': article['description'],
+                'significance_score': min(100, 20 + 10 * len(sources)),
+                'tags': [],
+                'sources': sources,
+                'urls': article.get('urls') or ([article['url']] if article.get('url') else []),
+                'is_update': False,
+                'changes_significant': True
+            })
+        return events
+    
+    def stream_llm(self, prompt: str) -> Iterator[str]:
+        """Stream from the configured LLM provider with timeouts, retries and the circuit breaker"""
+        return self.llm_client.stream(prompt)
+    
+    def process_llm_batch(self, articles: List[Dict[str, Any]], existing_events_text: str,
+                          on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Run one batch of articles through the LLM.
+        
+        The response is streamed and parsed incrementally; each event is
+        passed to `on_event` as soon as its JSON object is complete. If the
+        stream breaks off, the events that already arrived are kept.
+        Returns (events, finished); finished is False unless the LLM's
+        complete answer was received, e.g. after a truncated stream or the
+        heuristic fallback.
+        """
+        events = []
+        rejected = []
+        def emit(raw_event: Any):
+            # Validate each event on its own so one bad object doesn't cost the batch
+            event, error = validate_event(raw_event)
+            if error:
+                rejected.append(error)
+                logger.warning(f"Rejected LLM event ({error}): {str(raw_event)[:200]}")
+                return
+            events.append(event)
+            if on_event:
+                on_event(event)
         
         try:
-            # LLM prompt for event compilation and ranking
-            prompt = f"""
-            Analyze the following news articles and existing events:
-            
-            {existing_events_text}
-            
-            New Articles:
-            {articles_text}
-            
-            Your task:
-            1. For each new article, determine if it relates to an existing event or represents a new event
-            2. If it relates to an existing event, compare the information and determine if there are meaningful new developments
-            3. If it's a new event, generate a new event_id (use the title and description to create a unique identifier)
-            4. Compile comprehensive summaries for each event
-            5. Assign significance scores (0-100) based on:
-               - Global impact
-               - Number of people affected
-               - Economic significance
-               - Political importance
-               - Scientific/technological breakthrough
-               - Urgency/timeliness
-            
-            CRITICAL: For updates to existing events, ONLY mark as update if there are substantial new developments such as:
-            - New facts or numbers (e.g., "Death toll rises to 50", "100 people affected")
-            - New statements or accusations (e.g., "Trump blames Biden", "Company admits fault")
-            - Breaking developments (e.g., "New evidence emerges", "CEO resigns")
-            - Major changes in the story (e.g., "Investigation reveals", "Court rules against")
-            
-            DO NOT update for:
-            - Minor rephrasing with same meaning
-            - Small score adjustments without new info
-            - Duplicate information from different sources
-            - Minor editorial changes
-            
-            Return a JSON array with objects containing:
-            - event_id: existing event_id if updating, or new unique identifier if new event
-            - title: compelling headline
-            - description: comprehensive summary
-            - significance_score: 0-100
-            - tags: relevant categories
-            - sources: list of source names
-            - urls: list of article URLs
-            - is_update: true if updating existing event with meaningful new info, false if new event
-            - update_description: brief description of what changed (only for meaningful updates, max 100 chars)
-            - changes_significant: true/false - whether the changes warrant a new update record
-            """
-            
-            # Call appropriate LLM based on provider
-            if self.llm_provider == "openai":
-                content = self.call_openai_llm(prompt)
-            elif self.llm_provider == "gemini":
-                content = self.call_gemini_llm(prompt)
-            else:
-                raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
+            started = time.monotonic()
+            articles_text = "".join(
+                self.format_article_for_prompt(i + 1, article) for i, article in enumerate(articles)
+            )
+            prompt = self.build_llm_prompt(articles_text, existing_events_text)
+            
+            # An identical prompt (e.g. a retried run or a restart) reuses the stored answer
+            content = get_cached_response(prompt, self.llm_provider, self.llm_model, self.llm_cache_ttl_hours)
+            if content is not None:
+                for event in iter_json_array([content]):
+                    emit(event)
+                logger.info(f"LLM batch served {len(events)} events from cache")
+                return events, True
+            
+            chunks = []
+            def record(stream: Iterator[str]) -> Iterator[str]:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
             
+            parser = JSONArrayStream()
             try:
-                # Extract JSON from response
-                json_start = content.find('[')
-                json_end = content.rfind(']') + 1
-                if json_start != -1 and json_end != -1:
-                    json_str = content[json_start:json_end]
-                    events = json.loads(json_str)
-                    return events
-                else:
-                    logger.error("Could not find JSON in LLM response")
-                    return []
-                    
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing LLM response: {e}")
-                logger.error(f"Raw response: {content}")
-                return []
-                
+                for event in iter_json_array(record(self.stream_llm(prompt)), parser):
+                    if not events:
+                        logger.info(f"First LLM event arrived after {time.monotonic() - started:.2f}s")
+                    emit(event)
+            finally:
+                if chunks:
+                    self.parse_metrics.record_call(len(events), len(rejected) + len(parser.malformed), parser.complete)
+            logger.info(f"LLM batch returned {len(events)} events ({len(rejected) + len(parser.malformed)} rejected) "
+                        f"in {time.monotonic() - started:.2f}s")
+            
+            if not parser.complete:
+                logger.warning(f"LLM response ended before the event array closed; kept {len(events)} events")
+            elif events:
+                store_response(prompt, self.llm_provider, self.llm_model, "".join(chunks),
+                               self.llm_cache_ttl_hours, self.llm_cache_max_entries)
+            return events, parser.complete
+        except LLMProviderError as e:
+            if events:
+                logger.warning(f"LLM stream interrupted after {len(events)} events, keeping them: {e}")
+                return events, False
+            logger.error(f"LLM unavailable, falling back to heuristic ranking: {e}")
+            for event in self.heuristic_rank_events(articles):
+                emit(event)
+            return events, False
         except Exception as e:
             logger.error(f"Error with LLM processing: {e}")
-            return []
+            return events, False
     
-    def update_existing_events(self, new_events: List[Dict[str, Any]], db: Session):
-        """Update existing events with new information"""
-        for event in new_events:
-            event_id = event.get('event_id')
-            is_update = event.get('is_update', False)
-            changes_significant = event.get('changes_significant', True)  # Default to True for backward compatibility
-            
-            if not event_id or not is_update:
-                continue
+    def merge_llm_events(self, event_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Merge the events from several batches, reconciling repeated event_ids.
+        
+        When batches disagree about an event, the highest-scoring version
+        supplies the title, description and score. Sources, URLs and tags
+        are unioned, and the event counts as a (significant) update if any
+        batch said so.
+        """
+        merged = {}
+        for events in event_lists:
+            for event in events:
+                event_id = event.get('event_id')
+                if not event_id:
+                    continue
+                current = merged.get(event_id)
+                if current is None:
+                    merged[event_id] = dict(event)
+                    continue
                 
-            existing_article = db.query(Article).filter(Article.event_id == event_id).first()
-            if existing_article:
+                winner, other = (event, current) if event.get('significance_score', 0) > current.get('significance_score', 0) else (current, event)
+                combined = dict(winner)
+                for key in ('sources', 'urls', 'tags'):
+                    combined[key] = list(dict.fromkeys((current.get(key) or []) + (event.get(key) or [])))
+                combined['is_update'] = bool(current.get('is_update') or event.get('is_update'))
+                combined['changes_significant'] = bool(current.get('changes_significant', True) or event.get('changes_significant', True))
+                combined['update_description'] = winner.get('update_description') or other.get('update_description')
+                merged[event_id] = combined
+        return list(merged.values())
+    
+    def process_with_llm(self, articles: List[Dict[str, Any]], existing_events: List[Dict[str, Any]],
+                         on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         on_batch_done: Optional[Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]] = None
+                         ) -> List[Dict[str, Any]]:
+        """Use LLM to compile events and assign significance scores.
+        
+        Articles are split into token-budgeted batches that run concurrently
+        against the configured provider, and the resulting events are merged.
+        `on_event` is called from the batch threads with each event as soon
+        as it has been parsed, and `on_batch_done(articles, events)` once a
+        batch's complete answer has been received.
+        """
+        if not articles:
+            return []
+        
+        existing_events_text = self.format_existing_events_for_prompt(existing_events)
+        batches = self.batch_articles(articles, existing_events_text)
+        logger.info(f"Sending {len(articles)} articles to the LLM in {len(batches)} batches")
+        
+        def run_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            events, finished = self.process_llm_batch(batch, existing_events_text, on_event)
+            if finished and on_batch_done:
+                on_batch_done(batch, events)
+            return events
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.llm_batch_concurrency, len(batches))), thread_name_prefix="llm-batch") as executor:
+            event_lists = list(executor.map(run_batch, batches))
+        
+        return self.merge_llm_events(event_lists)
+    
+    def persist_events(self, events: List[Dict[str, Any]], db: Session):
+        """Write a batch of events with a fixed number of statements.
+        
+        All referenced event_ids are looked up in one query. Updates are
+        applied with one executemany UPDATE, new articles are inserted with
+        one INSERT ... RETURNING id, and their sources, tags and update
+        history rows go in with one executemany INSERT per table.
+        """
+        if not events:
+            return
+        now = datetime.utcnow()
+        
+        existing_ids = dict(db.query(Article.event_id, Article.id).filter(
+            Article.event_id.in_([event['event_id'] for event in events])
+        ))
+        
+        updates, creates = [], []
+        for event in events:
+            event_id = event['event_id']
+            if event.get('is_update'):
+                if event_id not in existing_ids:
+                    continue
                 # Check if the LLM determined changes are significant
-                if not changes_significant:
+                if not event.get('changes_significant', True):
                     logger.info(f"LLM determined no significant changes for event: {event_id}")
                     continue
-                
-                # Get the update description from LLM
-                update_description = event.get('update_description', 'Updated with new information')
-                
-                # Update with new information
-                existing_article.title = event.get('title') or existing_article.title
-                existing_article.description = event.get('description') or existing_article.description
-                existing_article.significance_score = event.get('significance_score', existing_article.significance_score)
-                existing_article.updated_at = datetime.utcnow()
-                existing_article.last_ranked_at = datetime.utcnow()
-                
-                # Add update to history with meaningful description
-                update = UpdateHistory(
-                    article_id=existing_article.id,
-                    date_time=datetime.utcnow(),
-                    description=update_description
-                )
-                db.add(update)
-                
-                # Update tags if new ones provided
-                if event.get('tags'):
-                    # Remove existing tags
-                    db.query(ArticleTag).filter(ArticleTag.article_id == existing_article.id).delete()
-                    
-                    # Add new tags
-                    for tag_name in event.get('tags', []):
-                        tag = db.query(Tag).filter(Tag.name == tag_name).first()
-                        if not tag:
-                            tag = Tag(name=tag_name)
-                            db.add(tag)
-                            db.flush()
-                        
-                        article_tag = ArticleTag(
-                            article_id=existing_article.id,
-                            tag_id=tag.id
-                        )
-                        db.add(article_tag)
-                
-                logger.info(f"Updated existing event: {event_id} - {update_description}")
-    
-    def create_new_events(self, new_events: List[Dict[str, Any]], db: Session):
-        """Create new events in the database"""
-        for event in new_events:
-            event_id = event.get('event_id')
-            is_update = event.get('is_update', False)
-            
-            if not event_id or is_update:
-                continue
-                
-            # Check if event already exists
-            existing = db.query(Article).filter(Article.event_id == event_id).first()
-            if existing:
-                continue
-            
-            # Apply significance score bonus for new events
-            base_score = event.get('significance_score', 0.0)
-            significance_score = base_score + self.new_event_bonus
+                updates.append(event)
+            elif event_id not in existing_ids:
+                creates.append(event)
+        if not updates and not creates:
+            return
+        version = change_version(db)
+        
+        tag_ids = tag_cache.resolve([tag_name for event in updates + creates for tag_name in event.get('tags', [])], db)
+        history_rows, source_rows, tag_rows = [], [], []
+        
+        if updates:
+            article_rows = []
+            for event in updates:
+                article_row = {
+                    'id': existing_ids[event['event_id']],
+                    'title': event['title'],
+                    'significance_score': event['significance_score'],
+                    'base_score': event['significance_score'],
+                    'updated_at': now,
+                    'latest_update_datetime': now,
+                    'last_ranked_at': now,
+                    'change_version': version
+                }
+                if event.get('description'):
+                    article_row['description'] = event['description']
+                article_rows.append(article_row)
+            db.execute(update(Article), article_rows)
             
-            # Create new article
-            article = Article(
-                title=event.get('title', ''),
-                description=event.get('description', ''),
-                url=event.get('urls', [''])[0] if event.get('urls') else '',
-                event_id=event_id,
-                significance_score=significance_score,
-                is_active=True,
-                last_ranked_at=datetime.utcnow()
+            # Replace the tags of updated events that came with new ones
+            retagged = [event for event in updates if event.get('tags')]
+            if retagged:
+                db.execute(delete(ArticleTag).where(
+                    ArticleTag.article_id.in_([existing_ids[event['event_id']] for event in retagged])
+                ))
+            for event in updates:
+                article_id = existing_ids[event['event_id']]
+                update_description = event.get('update_description') or 'Updated with new information'
+                history_rows.append({'article_id': article_id, 'date_time': now, 'description': update_description})
+                tag_rows.extend(
+                    {'article_id': article_id, 'tag_id': tag_id}
+                    for tag_id in dict.fromkeys(tag_ids[tag_name] for tag_name in event.get('tags', []) if tag_name in tag_ids)
+                )
+                logger.info(f"Updated existing event: {event['event_id']} - {update_description}")
+        
+        if creates:
+            created_ids = dict(
+                (event_id, article_id) for article_id, event_id in db.execute(
+                    insert(Article).returning(Article.id, Article.event_id),
+                    [
+                        {
+                            'title': event['title'],
+                            'description': event.get('description', ''),
+                            'url': event['urls'][0] if event.get('urls') else '',
+                            'event_id': event['event_id'],
+                            # Apply significance score bonus for new events
+                            'significance_score': event['significance_score'] + self.new_event_bonus,
+                            'base_score': event['significance_score'] + self.new_event_bonus,
+                            'is_active': True,
+                            'last_ranked_at': now,
+                            'change_version': version
+                        }
+                        for event in creates
+                    ]
+                )
             )
-            db.add(article)
-            db.flush()  # Get the article ID
-            
-            # Add sources
-            for source_name in event.get('sources', []):
-                source = Source(
+            for event in creates:
+                article_id = created_ids[event['event_id']]
+                source_rows.extend(
+                    {
+                        'article_id': article_id,
+                        'name': source_name,
+                        'url': '',
+                        'citation': f"{source_name}, {now.year}"
+                    }
+                    for source_name in event.get('sources', [])
+                )
+                tag_rows.extend(
+                    {'article_id': article_id, 'tag_id': tag_id}
+                    for tag_id in dict.fromkeys(tag_ids[tag_name] for tag_name in event.get('tags', []) if tag_name in tag_ids)
+                )
+                # Add initial update history with descriptive message
+                initial_description = f"Event created: {event['title'][:50]}..."
+                history_rows.append({'article_id': article_id, 'date_time': now, 'description': initial_description})
+                logger.info(f"Created new event: {event['event_id']} - {initial_description}")
+        
+        for model, rows in ((Source, source_rows), (ArticleTag, tag_rows), (UpdateHistory, history_rows)):
+            if rows:
+                db.execute(insert(model), rows)
+    
+    def persist_event_chunk(self, events: List[Dict[str, Any]], applied_events: Dict[str, Dict[str, Any]], db: Session) -> bool:
+        """Write a chunk of streamed events.
+        
+        Each chunk is written in its own savepoint so a bad one doesn't undo
+        the others. An event_id already written during this run (e.g. from
+        another batch) is reconciled with the earlier version. Returns False
+        if the chunk was rolled back.
+        """
+        fresh, repeats = [], []
+        for event in self.merge_llm_events([events]):
+            (repeats if event['event_id'] in applied_events else fresh).append(event)
+        
+        written = {}
+        try:
+            with db.begin_nested():
+                self.persist_events(fresh, db)
+                written.update((event['event_id'], event) for event in fresh)
+                for event in repeats:
+                    merged = self.merge_llm_events([[applied_events[event['event_id']]], [event]])[0]
+                    self.reconcile_event(merged, db)
+                    written[event['event_id']] = merged
+        except Exception as e:
+            logger.error(f"Error persisting events {[event['event_id'] for event in events]}: {e}")
+            return False
+        applied_events.update(written)
+        return True
+    
+    def reconcile_event(self, event: Dict[str, Any], db: Session):
+        """Fold a later batch's version of an event into the article already written this run"""
+        article = db.query(Article).filter(Article.event_id == event['event_id']).first()
+        if article is None:
+            # The earlier version was skipped (e.g. an insignificant update)
+            self.persist_events([event], db)
+            return
+        
+        article.change_version = change_version(db)
+        article.latest_update_datetime = datetime.utcnow()
+        score = event.get('significance_score', 0.0) + (0 if event.get('is_update') else self.new_event_bonus)
+        if score > (article.base_score if article.base_score is not None else article.significance_score):
+            article.base_score = score
+            article.significance_score = score
+            article.title = event.get('title') or article.title
+            article.description = event.get('description') or article.description
+        
+        source_names = {source.name for source in article.sources}
+        for source_name in event.get('sources', []):
+            if source_name not in source_names:
+                db.add(Source(
                     article_id=article.id,
                     name=source_name,
                     url='',
                     citation=f"{source_name}, {datetime.now().year}"
-                )
-                db.add(source)
-            
-            # Add tags
-            for tag_name in event.get('tags', []):
-                tag = db.query(Tag).filter(Tag.name == tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name)
-                    db.add(tag)
-                    db.flush()
-                
-                article_tag = ArticleTag(
-                    article_id=article.id,
-                    tag_id=tag.id
-                )
-                db.add(article_tag)
-            
-            # Add initial update history with descriptive message
-            initial_description = f"Event created: {event.get('title', '')[:50]}..."
-            update = UpdateHistory(
-                article_id=article.id,
-                date_time=datetime.utcnow(),
-                description=initial_description
+                ))
+        
+        tag_names = {
+            name for (name,) in db.query(Tag.name).join(ArticleTag, ArticleTag.tag_id == Tag.id).filter(
+                ArticleTag.article_id == article.id
             )
-            db.add(update)
-            
-            logger.info(f"Created new event: {event_id} - {initial_description}")
+        }
+        add_article_tags(article.id, [tag_name for tag_name in event.get('tags', []) if tag_name not in tag_names], db)
+        
+        logger.info(f"Reconciled event {event['event_id']} with a later batch")
     
     def calculate_age_penalty(self, db: Session):
-        """Calculate age penalty for events older than 1 day"""
-        one_day_ago = datetime.utcnow() - timedelta(days=1)
-        
-        old_articles = db.query(Article).filter(
-            Article.created_at < one_day_ago,
-            Article.is_active == True
-        ).all()
+        """Derive age penalties and scores of active events from created_at and base_score.
         
-        for article in old_articles:
-            days_old = (datetime.utcnow() - article.created_at).days
-            age_penalty = min(days_old * 10, 50)  # Max 50% penalty
-            article.age_penalty = age_penalty
-            article.significance_score = max(0, article.significance_score - age_penalty)
-            
-        db.commit()
+        The penalty is recomputed from scratch every run (10 points per full
+        day of age, max 50), so scores don't drift however often it runs.
+        """
+        now = datetime.utcnow()
+        age_penalty = case(
+            *[(Article.created_at < now - timedelta(days=days), days * 10) for days in range(5, 0, -1)],
+            else_=0
+        )
+        # Rows written before base_score existed get it back-filled from their current penalty
+        base_score = func.coalesce(Article.base_score, Article.significance_score + func.coalesce(Article.age_penalty, 0))
+        significance_score = case((base_score > age_penalty, base_score - age_penalty), else_=0)
+        db.execute(
+            update(Article).where(Article.is_active == True).values(
+                base_score=base_score,
+                age_penalty=age_penalty,
+                significance_score=significance_score,
+                # Only events whose score moved count as changed
+                change_version=case(
+                    (func.coalesce(Article.significance_score, -1) != significance_score, change_version(db)),
+                    else_=Article.change_version
+                )
+            ).execution_options(synchronize_session="fetch")
+        )
     
     def evict_oldest_events(self, db: Session):
         """Evict the least significant events to maintain max_active_events limit"""
-        active_articles = db.query(Article).filter(
-            Article.is_active == True
-        ).order_by(Article.significance_score.asc()).all()
-        
-        if len(active_articles) > self.max_active_events:
-            # Deactivate the least significant events
-            to_deactivate = active_articles[:len(active_articles) - self.max_active_events]
-            
-            for article in to_deactivate:
-                article.is_active = False
-                logger.info(f"Deactivated event: {article.title} (score: {article.significance_score})")
-            
-            db.commit()
+        ranked = select(
+            Article.id,
+            func.row_number().over(order_by=(Article.significance_score.desc(), Article.id.desc())).label('position')
+        ).where(Article.is_active == True).subquery()
+        evicted = db.execute(
+            update(Article).where(Article.id.in_(
+                select(ranked.c.id).where(ranked.c.position > self.max_active_events)
+            )).values(is_active=False, change_version=change_version(db)).returning(Article.title, Article.significance_score)
+            .execution_options(synchronize_session="fetch")
+        ).all()
+        for title, significance_score in evicted:
+            logger.info(f"Deactivated event: {title} (score: {significance_score})")
     
     def deactivate_old_events(self, db: Session, days: int = 2):
         """Deactivate events older than a given number of days (default: 2)"""
         cutoff = datetime.utcnow() - timedelta(days=days)
-        old_articles = db.query(Article).filter(
-            Article.is_active == True,
-            Article.created_at < cutoff
+        expired = db.execute(
+            update(Article).where(
+                Article.is_active == True,
+                Article.created_at < cutoff
+            ).values(is_active=False, change_version=change_version(db)).returning(Article.title, Article.created_at)
+            .execution_options(synchronize_session="fetch")
         ).all()
-        for article in old_articles:
-            article.is_active = False
-            logger.info(f"Deactivated event due to age: {article.title} (created at: {article.created_at})")
-        db.commit()
+        for title, created_at in expired:
+            logger.info(f"Deactivated event due to age: {title} (created at: {created_at})")
     
-    def aggregate_news(self):
-        """Main function to aggregate news from all sources"""
+    def write_front_page_snapshot(self, db: Session):
+        """Pre-render the /api/news document for the current active events"""
+        snapshot = write_front_page_snapshot(db)
+        logger.info(f"Wrote front page snapshot version {snapshot.version}")
+        return snapshot
+    
+    def aggregate_news(self, on_stage: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
+        """Main function to aggregate news from all sources.
+        
+        `on_stage(stage, **counts)` is called as the run progresses. Returns a
+        summary of the run; errors are logged and reported as status 'failed'.
+        Use self.jobs.submit() to run it in the background without overlapping
+        another run.
+        """
         logger.info("Starting news aggregation...")
+        report = on_stage or (lambda stage, **counts: None)
         
         db = self.get_db()
         try:
-            # Fetch articles from all sources
-            rss_articles = self.fetch_rss_feeds()
-            newsapi_articles = self.fetch_newsapi()
+            # Only fetch the feeds that are due this tick
+            report("fetching")
+            self.ensure_default_feed_sources(db)
+            due_feeds = self.get_due_feed_sources(db)
+            if not due_feeds:
+                logger.info("No feeds due for polling")
+                return {"status": "no_feeds_due"}
+            report("fetching", due_feeds=len(due_feeds))
+            
+            rss_sources = {
+                feed_source.url: feed_source
+                for feed_source in due_feeds if feed_source.source_type == 'rss' and feed_source.url
+            }
+            rss_results = self.fetch_rss_feeds({
+                feed_url: {'etag': feed_source.etag, 'last_modified': feed_source.last_modified}
+                for feed_url, feed_source in rss_sources.items()
+            })
+            self.record_rss_fetch_results(rss_results, rss_sources)
+            rss_articles = [article for result in rss_results for article in result['articles']]
+            
+            newsapi_articles = []
+            for feed_source in due_feeds:
+                if feed_source.source_type == 'newsapi':
+                    newsapi_articles = self.fetch_newsapi()
+                    self.schedule_next_poll(feed_source, newsapi_articles)
+                    break
             all_articles = rss_articles + newsapi_articles
             
-            logger.info(f"Fetched {len(all_articles)} total articles")
+            logger.info(f"Fetched {len(all_articles)} total articles from {len(due_feeds)} due feeds")
+            
+            # Only items that are new or changed since they were last ingested go to the LLM
+            report("filtering", fetched_articles=len(all_articles))
+            all_articles = filter_unseen_articles(all_articles, db)
+            logger.info(f"{len(all_articles)} articles are new or changed")
             
             if not all_articles:
-                return
+                # Nothing new to process; just keep the updated poll schedule and validators
+                self.record_rss_validators(rss_results, rss_sources, [])
+                db.commit()
+                return {"status": "no_new_articles", "due_feeds": len(due_feeds)}
+            
+            # Send one representative per story, carrying all of its sources
+            report("clustering", new_articles=len(all_articles))
+            new_articles = all_articles
+            article_count = len(all_articles)
+            all_articles = cluster_articles(all_articles, self.cluster_similarity_threshold)
+            logger.info(f"Clustered {article_count} articles into {len(all_articles)} stories")
             
             # Get existing events for matching
             existing_events = self.get_existing_events_for_matching(db)
             logger.info(f"Found {len(existing_events)} existing events for matching")
             
-            # Process with LLM
-            events = self.process_with_llm(all_articles, existing_events)
-            logger.info(f"LLM processed {len(events)} events")
+            # Take this run's change version before the first savepoint (see change_version)
+            change_version(db)
             
-            if not events:
-                return
+            # Process with LLM, writing events in small chunks as they stream in.
+            # Batch threads share the session, so writes are serialized.
+            report("llm", stories=len(all_articles), events_written=0)
+            applied_events = {}
+            pending_events = []
+            failed_event_ids = set()
+            finished_batches = []
+            write_lock = threading.Lock()
+            def flush():
+                if not self.persist_event_chunk(pending_events[:], applied_events, db):
+                    failed_event_ids.update(event['event_id'] for event in pending_events)
+                pending_events.clear()
+            def persist(event: Dict[str, Any]):
+                with write_lock:
+                    pending_events.append(event)
+                    if len(pending_events) >= self.event_write_chunk_size:
+                        flush()
+                        report("llm", events_written=len(applied_events))
+            def batch_done(batch: List[Dict[str, Any]], batch_events: List[Dict[str, Any]]):
+                with write_lock:
+                    finished_batches.append((batch, batch_events))
             
-            # Update existing events
-            self.update_existing_events(events, db)
+            events = self.process_with_llm(all_articles, existing_events, on_event=persist, on_batch_done=batch_done)
+            with write_lock:
+                flush()
+            logger.info(f"LLM processed {len(events)} events")
             
-            # Create new events
-            self.create_new_events(events, db)
+            # Only articles whose batch came back complete and was written are
+            # marked as seen; the rest go to the LLM again next cycle
+            processed = [
+                member
+                for batch, batch_events in finished_batches
+                if not any(event['event_id'] in failed_event_ids for event in batch_events)
+                for article in batch
+                for member in article.get('members', [article])
+            ]
+            mark_articles_seen(processed, db)
+            logger.info(f"Marked {len(processed)} of {article_count} new articles as seen")
+            processed_hashes = {item_fingerprint(article)['url_hash'] for article in processed}
+            unprocessed = [article for article in new_articles if item_fingerprint(article)['url_hash'] not in processed_hashes]
             
+            if not events:
+                # Nothing was written, so keep nothing: the feeds stay due and
+                # their items go to the LLM again on the next tick
+                db.rollback()
+                return {"status": "no_events", "stories": len(all_articles)}
+            
+            # Lifecycle maintenance runs in the same transaction as the event writes
+            report("maintenance", events_written=len(applied_events))
             # Calculate age penalties
             self.calculate_age_penalty(db)
             
@@ -477,39 +1013,76 @@ class NewsAggregator:
             self.evict_oldest_events(db)
             
             # Clean up duplicate updates
-            self.cleanup_duplicate_updates(db)
+            self.cleanup_duplicate_updates(db, list(applied_events))
+            
+            # Forget fingerprints of items that have dropped out of every feed
+            pruned = prune_seen_items(db, self.seen_item_retention_days)
+            if pruned:
+                logger.info(f"Pruned {pruned} stale seen-item fingerprints")
+            
+            # Publish the ranked events in the same commit as the changes
+            report("publishing")
+            snapshot = self.write_front_page_snapshot(db)
+            self.record_rss_validators(rss_results, rss_sources, unprocessed)
             
             db.commit()
+            news_cache.observe_version(snapshot.version)
             logger.info("News aggregation completed successfully")
+            return {"status": "completed", "stories": len(all_articles), "events": len(events)}
             
         except Exception as e:
             logger.error(f"Error in news aggregation: {e}")
             db.rollback()
+            return {"status": "failed", "error": str(e)}
         finally:
             db.close()
     
     def start_scheduler(self):
-        """Start the background scheduler"""
+        """Start the background scheduler.
+        
+        Every process starts one, but only the process holding the leader lock
+        runs the schedule. The others retry the lock on every heartbeat and
+        take over within one heartbeat of the leader dying.
+        """
         if self.scheduler_running:
             logger.info("Scheduler is already running")
             return self.scheduler_thread
             
-        # Schedule aggregation every 15 minutes
-        schedule.every(15).minutes.do(self.aggregate_news)
-        
-        # Run initial aggregation
-        self.aggregate_news()
+        # Check for due feeds every few minutes; each feed keeps its own interval.
+        # Ticks go through the job runner, so they never overlap a manual run.
+        schedule.every(self.scheduler_tick_minutes).minutes.do(self.jobs.submit, "scheduler")
         
         logger.info("News aggregator scheduler started")
         
         # Run the scheduler in a separate thread
         def run_scheduler():
-            self.scheduler_running = True
-            while self.scheduler_running:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-            logger.info("News aggregator scheduler stopped")
+            try:
+                while self.scheduler_running:
+                    # One bad tick (a database hiccup, a failed submit) must not
+                    # end the thread; otherwise the lock stops being heartbeated
+                    # while this process still holds it
+                    try:
+                        was_leader = self.is_leader
+                        self.is_leader = self.leader_lock.is_held() or self.leader_lock.acquire()
+                        if self.is_leader and not was_leader:
+                            logger.info("This process is now the aggregation leader")
+                            # Catch up straight away rather than waiting a full tick
+                            self.jobs.submit("scheduler")
+                        elif was_leader and not self.is_leader:
+                            logger.warning("Lost aggregation leadership")
+                        
+                        if self.is_leader:
+                            schedule.run_pending()
+                    except Exception:
+                        logger.exception("Scheduler tick failed")
+                    self.scheduler_stop.wait(self.leader_heartbeat_seconds)
+            finally:
+                self.leader_lock.release()
+                self.is_leader = False
+                logger.info("News aggregator scheduler stopped")
         
+        self.scheduler_running = True
+        self.scheduler_stop.clear()
         self.scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
         self.scheduler_thread.start()
         
@@ -523,6 +1096,7 @@ class NewsAggregator:
             
         logger.info("Stopping news aggregator scheduler...")
         self.scheduler_running = False
+        self.scheduler_stop.set()
         
         # Clear all scheduled jobs
         schedule.clear()
@@ -537,50 +1111,62 @@ class NewsAggregator:
         
         self.scheduler_thread = None
     
-    def cleanup_duplicate_updates(self, db: Session):
-        """Remove duplicate or meaningless updates from the database"""
+    def cleanup_duplicate_updates(self, db: Session, event_ids: List[str]):
+        """Remove duplicate or meaningless updates from the events touched in this run"""
+        if not event_ids:
+            return
+        duplicate_descriptions = [
+            "Updated with new information from feeds",
+            "Updated with new information",
+            "Event created from news aggregation"
+        ]
+        touched_ids = select(Article.id).where(Article.event_id.in_(event_ids)).scalar_subquery()
         try:
-            # Find articles with multiple similar updates
-            articles = db.query(Article).all()
-            cleaned_count = 0
-            
-            for article in articles:
-                updates = db.query(UpdateHistory).filter(
-                    UpdateHistory.article_id == article.id
-                ).order_by(UpdateHistory.date_time.asc()).all()
-                
-                if len(updates) <= 1:
-                    continue
-                
-                # Keep the first update and remove duplicates
-                first_update = updates[0]
-                duplicate_descriptions = [
-                    "Updated with new information from feeds",
-                    "Updated with new information",
-                    "Event created from news aggregation"
-                ]
-                
-                for update in updates[1:]:
-                    if update.description in duplicate_descriptions:
-                        db.delete(update)
-                        cleaned_count += 1
-                
-                # If we removed all updates except the first, and the first is also generic,
-                # replace it with a better description
-                remaining_updates = db.query(UpdateHistory).filter(
-                    UpdateHistory.article_id == article.id
-                ).count()
+            with db.begin_nested():
+                # Keep each article's first update and drop the generic ones after it
+                ranked = select(
+                    UpdateHistory.id,
+                    UpdateHistory.description,
+                    func.row_number().over(
+                        partition_by=UpdateHistory.article_id,
+                        order_by=(UpdateHistory.date_time.asc(), UpdateHistory.id.asc())
+                    ).label('position')
+                ).where(UpdateHistory.article_id.in_(touched_ids)).subquery()
+                cleaned = db.execute(
+                    delete(UpdateHistory).where(UpdateHistory.id.in_(
+                        select(ranked.c.id).where(
+                            ranked.c.position > 1,
+                            ranked.c.description.in_(duplicate_descriptions)
+                        )
+                    )).returning(UpdateHistory.article_id).execution_options(synchronize_session=False)
+                ).scalars().all()
                 
-                if remaining_updates == 1 and first_update.description in duplicate_descriptions:
-                    first_update.description = f"Event created: {article.title[:50]}..."
-            
-            db.commit()
-            if cleaned_count > 0:
-                logger.info(f"Cleaned up {cleaned_count} duplicate/meaningless updates")
+                # If only a generic first update is left, replace it with a better description
+                other_update = aliased(UpdateHistory)
+                renamed = db.execute(
+                    update(UpdateHistory).where(
+                        UpdateHistory.article_id.in_(touched_ids),
+                        UpdateHistory.description.in_(duplicate_descriptions),
+                        ~select(other_update.id).where(
+                            other_update.article_id == UpdateHistory.article_id,
+                            other_update.id != UpdateHistory.id
+                        ).exists()
+                    ).values(description=select(
+                        literal("Event created: ") + func.substr(Article.title, 1, 50) + "..."
+                    ).where(Article.id == UpdateHistory.article_id).scalar_subquery()
+                    ).returning(UpdateHistory.article_id).execution_options(synchronize_session=False)
+                ).scalars().all()
                 
+                changed_ids = set(cleaned) | set(renamed)
+                if changed_ids:
+                    db.execute(
+                        update(Article).where(Article.id.in_(changed_ids)).values(change_version=change_version(db))
+                        .execution_options(synchronize_session="fetch")
+                    )
+            if cleaned:
+                logger.info(f"Cleaned up {len(cleaned)} duplicate/meaningless updates")
         except Exception as e:
             logger.error(f"Error cleaning up updates: {e}")
-            db.rollback()
 
 # Global aggregator instance
 aggregator = NewsAggregator() 
\ No newline at end of file
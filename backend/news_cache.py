@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+
+class NewsResponseCache:
+    """In-process cache of the serialized /api/news response.
+
+    The cached body is keyed by a data generation counter, which is bumped
+    whenever the front page snapshot version changes. The process that ran the
+    aggregation reports the new version right after its commit. Other worker
+    processes notice it by re-reading the version at most every
+    `revalidate_seconds`. Either way the body is rebuilt at most once per
+    aggregation run no matter how many requests come in.
+    """
+
+    def __init__(self, revalidate_seconds: float = 5):
+        self.generation = 0
+        self.revalidate_seconds = revalidate_seconds
+        self.snapshot_version: Optional[int] = None
+        self.checked_at: Optional[float] = None
+        self._generation_lock = threading.Lock()
+        # Held while rebuilding so concurrent misses share a single rebuild
+        self._build_lock = asyncio.Lock()
+        # (generation, body, etag), replaced as a whole so readers never see
+        # a body paired with another generation's ETag
+        self._entry: Optional[Tuple[int, bytes, str]] = None
+
+    def needs_revalidation(self) -> bool:
+        """True when the snapshot version should be re-read from the database"""
+        checked_at = self.checked_at
+        return checked_at is None or time.monotonic() - checked_at >= self.revalidate_seconds
+
+    def observe_version(self, version: Optional[int]):
+        """Record the current snapshot version; a new version invalidates the body"""
+        with self._generation_lock:
+            self.checked_at = time.monotonic()
+            if version != self.snapshot_version:
+                self.snapshot_version = version
+                self.generation += 1
+
+    async def get_async(self, build: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, str]:
+        """Return (body, etag) for the current generation, rebuilding on a miss"""
+        body, etag = self._lookup(self.generation)
+        if body is not None:
+            return body, etag
+
+        async with self._build_lock:
+            # Another request may have finished the rebuild while we waited
+            generation = self.generation
+            body, etag = self._lookup(generation)
+            if body is not None:
+                return body, etag
+
+            return self._store(generation, await build())
+
+    def _store(self, generation: int, body: bytes) -> Tuple[bytes, str]:
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        # Store under the generation read before the build started. If the
+        # aggregator committed in the meantime, the next request rebuilds.
+        self._entry = (generation, body, etag)
+        return body, etag
+
+    def _lookup(self, generation: int) -> Tuple[Optional[bytes], Optional[str]]:
+        entry = self._entry
+        if entry is not None and entry[0] == generation:
+            return entry[1], entry[2]
+        return None, None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# Global cache instance shared by the API and the aggregator
+news_cache = NewsResponseCache(float(os.getenv("NEWS_CACHE_REVALIDATE_SECONDS", 5)))
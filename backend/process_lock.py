@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+from database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+class ProcessLock(ABC):
+    """A non-blocking lock shared by every process running the aggregator.
+
+    acquire() returns immediately. The lock is released by release() or when
+    the holding process dies, so another process can take over.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def acquire(self) -> bool:
+        ...
+
+    @abstractmethod
+    def is_held(self) -> bool:
+        """Heartbeat: check that this process still holds the lock"""
+
+    @abstractmethod
+    def release(self):
+        ...
+
+class PostgresAdvisoryLock(ProcessLock):
+    """Session-level pg_try_advisory_lock held on a dedicated connection.
+
+    PostgreSQL drops the lock when the session ends. Server-side TCP
+    keepalives make it notice a crashed or unreachable holder within about
+    `keepalive_seconds`, not the OS default of hours.
+    """
+
+    def __init__(self, name: str, url: str, keepalive_seconds: int = 30):
+        super().__init__(name)
+        # Advisory lock keys are signed 64-bit integers
+        self.key = int.from_bytes(hashlib.sha256(name.encode("utf-8")).digest()[:8], "big", signed=True)
+        self.url = url
+        self.keepalive_seconds = keepalive_seconds
+        self.engine = None  # Created on the first acquire
+        self.connection: Optional[Connection] = None
+        self.lock = threading.Lock()
+
+    def create_engine(self):
+        probe_interval = max(self.keepalive_seconds // 6, 1)
+        return create_engine(
+            self.url,
+            poolclass=NullPool,
+            connect_args={"options": (
+                f"-c tcp_keepalives_idle={probe_interval * 3} "
+                f"-c tcp_keepalives_interval={probe_interval} "
+                f"-c tcp_keepalives_count=3"
+            )}
+        )
+
+    def acquire(self) -> bool:
+        with self.lock:
+            if self.connection is not None:
+                return True
+            try:
+                if self.engine is None:
+                    self.engine = self.create_engine()
+                connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            except Exception as e:
+                logger.warning(f"Could not connect to take lock {self.name}: {e}")
+                return False
+            try:
+                acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            except Exception as e:
+                logger.warning(f"Could not take lock {self.name}: {e}")
+                acquired = False
+            if acquired:
+                self.connection = connection
+            else:
+                connection.close()
+            return bool(acquired)
+
+    def is_held(self) -> bool:
+        with self.lock:
+            if self.connection is None:
+                return False
+            try:
+                # The lock lives as long as the session, so a live session means we still hold it
+                self.connection.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                logger.warning(f"Lost lock {self.name}: {e}")
+                self._close()
+                return False
+
+    def release(self):
+        with self.lock:
+            if self.connection is None:
+                return
+            try:
+                self.connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            except Exception as e:
+                logger.warning(f"Could not release lock {self.name}: {e}")
+            self._close()
+
+    def _close(self):
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+        self.connection = None
+
+class FileLock(ProcessLock):
+    """flock() on a local file, for running several workers on one machine without PostgreSQL"""
+
+    def __init__(self, name: str, path: str):
+        super().__init__(name)
+        self.path = path
+        self.file = None
+        self.lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        import fcntl
+        with self.lock:
+            if self.file is not None:
+                return True
+            lock_file = open(self.path, "a+")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            lock_file.seek(0)
+            lock_file.truncate()
+            lock_file.write(f"{os.getpid()}\n")
+            lock_file.flush()
+            self.file = lock_file
+            return True
+
+    def is_held(self) -> bool:
+        # The kernel only drops the lock when this process exits or releases it
+        return self.file is not None
+
+    def release(self):
+        import fcntl
+        with self.lock:
+            if self.file is None:
+                return
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+
+class LocalLock(ProcessLock):
+    """Lock that only coordinates threads of this process (LEADER_ELECTION=none)"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.lock = threading.Lock()
+        self.held = False
+
+    def acquire(self) -> bool:
+        if self.held:
+            return True
+        self.held = self.lock.acquire(blocking=False)
+        return self.held
+
+    def is_held(self) -> bool:
+        return self.held
+
+    def release(self):
+        if self.held:
+            self.held = False
+            self.lock.release()
+
+def create_process_lock(name: str) -> ProcessLock:
+    """Build the lock selected by LEADER_ELECTION: auto (default), postgres, file or none.
+
+    auto uses an advisory lock on PostgreSQL and a file lock otherwise.
+    """
+    mode = os.getenv("LEADER_ELECTION", "auto").lower()
+    if mode == "auto":
+        mode = "postgres" if DATABASE_URL.startswith("postgres") else "file"
+
+    if mode == "postgres":
+        return PostgresAdvisoryLock(
+            f"news_aggregator:{name}",
+            DATABASE_URL,
+            keepalive_seconds=int(os.getenv("LEADER_KEEPALIVE_SECONDS", 30))
+        )
+    elif mode == "file":
+        lock_dir = os.getenv("LEADER_LOCK_DIR", tempfile.gettempdir())
+        return FileLock(name, os.path.join(lock_dir, f"news_aggregator_{name}.lock"))
+    elif mode == "none":
+        return LocalLock(name)
+    else:
+        raise ValueError(f"Unsupported LEADER_ELECTION mode: {mode}")
@@ -0,0 +1,97 @@
+import hashlib
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from sqlalchemy.orm import Session
+from database import SeenItem
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "cmpid", "ocid", "at_medium", "at_campaign"}
+
+def normalize_url(url: str) -> str:
+    """Canonicalize an article URL so the same story from different feeds matches"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def item_fingerprint(article: Dict[str, Any]) -> Dict[str, str]:
+    """Return the url_hash and content_hash for a fetched article.
+    
+    Items without a link are keyed on their title instead.
+    """
+    content_hash = _sha256(f"{_normalize_text(article.get('title'))}\n{_normalize_text(article.get('description'))}")
+    url = article.get("url")
+    key = normalize_url(url) if url else f"title:{_normalize_text(article.get('title'))}"
+    return {"url_hash": _sha256(key), "content_hash": content_hash}
+
+def filter_unseen_articles(articles: List[Dict[str, Any]], db: Session) -> List[Dict[str, Any]]:
+    """Drop articles whose URL and content were already ingested.
+    
+    Only refreshes last_seen_at of the dropped ones. The articles that pass
+    are recorded by mark_articles_seen once they have been processed, so an
+    item whose LLM batch or write failed is tried again next cycle.
+    """
+    now = datetime.utcnow()
+    fingerprints = {}
+    for article in articles:
+        fingerprint = item_fingerprint(article)
+        # Keep the first copy when several feeds carry the same link
+        fingerprints.setdefault(fingerprint["url_hash"], (fingerprint["content_hash"], article))
+    if not fingerprints:
+        return []
+    
+    seen = {
+        seen_item.url_hash: seen_item
+        for seen_item in db.query(SeenItem).filter(SeenItem.url_hash.in_(list(fingerprints))).all()
+    }
+    
+    unseen = []
+    for url_hash, (content_hash, article) in fingerprints.items():
+        seen_item = seen.get(url_hash)
+        # Same link with a rewritten headline or summary counts as new
+        if seen_item is None or seen_item.content_hash != content_hash:
+            unseen.append(article)
+        else:
+            seen_item.last_seen_at = now
+    return unseen
+
+def mark_articles_seen(articles: List[Dict[str, Any]], db: Session):
+    """Record the fingerprints of processed articles; written when the caller commits"""
+    now = datetime.utcnow()
+    fingerprints = {}
+    for article in articles:
+        fingerprint = item_fingerprint(article)
+        fingerprints.setdefault(fingerprint["url_hash"], fingerprint["content_hash"])
+    if not fingerprints:
+        return
+    
+    seen = {
+        seen_item.url_hash: seen_item
+        for seen_item in db.query(SeenItem).filter(SeenItem.url_hash.in_(list(fingerprints))).all()
+    }
+    for url_hash, content_hash in fingerprints.items():
+        seen_item = seen.get(url_hash)
+        if seen_item is None:
+            db.add(SeenItem(url_hash=url_hash, content_hash=content_hash, first_seen_at=now, last_seen_at=now))
+        else:
+            seen_item.content_hash = content_hash
+            seen_item.last_seen_at = now
+
+def prune_seen_items(db: Session, days: int) -> int:
+    """Forget fingerprints that no feed has carried for the given number of days"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    return db.query(SeenItem).filter(SeenItem.last_seen_at < cutoff).delete(synchronize_session=False)
@@ -0,0 +1,85 @@
+import threading
+from typing import Dict, Iterable, List
+from sqlalchemy import event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from database import ArticleTag, Tag
+
+class TagCache:
+    """Process-wide tag name -> id cache with batched upserts for unknown names.
+
+    Tags are never deleted, so a cached id stays valid once the row that
+    holds it is committed. Ids the current transaction inserted or read back
+    are kept on the session and only promoted to the cache after it commits:
+    a read-back row may be one this transaction inserted in an earlier
+    savepoint, which a rollback would remove.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def resolve(self, names: Iterable[str], db: Session) -> Dict[str, int]:
+        """Map tag names to ids, inserting the missing ones in one statement"""
+        wanted = list(dict.fromkeys(name for name in names if name))
+        with self.lock:
+            resolved = {name: self.ids[name] for name in wanted if name in self.ids}
+        missing = [name for name in wanted if name not in resolved]
+        if not missing:
+            return resolved
+
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING only returns the rows this
+        # statement created. Names that already existed, or that a concurrent
+        # writer committed first, are read back afterwards.
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        inserted = dict(
+            (name, tag_id) for tag_id, name in db.execute(
+                dialect_insert(Tag)
+                .values([{"name": name} for name in missing])
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(Tag.id, Tag.name)
+            )
+        )
+        existing = {}
+        conflicted = [name for name in missing if name not in inserted]
+        if conflicted:
+            existing = dict(
+                (name, tag_id) for tag_id, name in db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(conflicted)))
+            )
+
+        pending = db.info.setdefault("pending_tag_ids", {})
+        pending.update(existing)
+        pending.update(inserted)
+        resolved.update(existing)
+        resolved.update(inserted)
+        return resolved
+
+    def promote_pending(self, db: Session):
+        pending = db.info.pop("pending_tag_ids", None)
+        if pending:
+            with self.lock:
+                self.ids.update(pending)
+
+    def discard_pending(self, db: Session):
+        db.info.pop("pending_tag_ids", None)
+
+# Global cache shared by every aggregation run in this process
+tag_cache = TagCache()
+
+@event.listens_for(Session, "after_commit")
+def _promote_pending_tags(session: Session):
+    # Also fires when a savepoint is released; only the outermost commit makes the rows durable
+    if not session.in_nested_transaction():
+        tag_cache.promote_pending(session)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_tags(session: Session, previous_transaction):
+    # Also fires when a savepoint rolls back, which may have removed tags we inserted
+    tag_cache.discard_pending(session)
+
+def add_article_tags(article_id: int, tag_names: List[str], db: Session):
+    """Attach tags to an article with a single executemany insert"""
+    tag_ids = tag_cache.resolve(tag_names, db)
+    rows = [{"article_id": article_id, "tag_id": tag_id} for tag_id in dict.fromkeys(tag_ids.values())]
+    if rows:
+        db.execute(insert(ArticleTag), rows)
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# The backend modules read their configuration at import time, so point them
+# at a scratch SQLite database before any test imports them. TEST_DB_URL runs
+# the suite against another database instead; its tables are dropped and
+# recreated by every test, so never point it at real data.
+TEST_DB_DIR = tempfile.mkdtemp(prefix="news-aggregator-tests-")
+os.environ["DB_URL"] = os.getenv("TEST_DB_URL", f"sqlite:///{os.path.join(TEST_DB_DIR, 'test.db')}")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("LEADER_ELECTION", "none")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+@pytest.fixture(autouse=True)
+def dispose_engines():
+    """Close every pooled connection after each test. aiosqlite runs each
+    connection on its own thread, and one left open keeps pytest from exiting."""
+    yield
+    import database
+    with database._engines_lock:
+        engines = list(database._engines.values())
+        database._engines.clear()
+    for engine in engines:
+        if isinstance(engine, database.AsyncEngine):
+            asyncio.run(engine.dispose())
+        else:
+            engine.dispose()
+
+@pytest.fixture
+def db():
+    """Session on freshly created, empty tables"""
+    import database
+    engine = database.get_engine()
+    database.Base.metadata.drop_all(engine)
+    database.Base.metadata.create_all(engine)
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def statements():
+    """SQL statements sent through the API and async engines while the test runs"""
+    from sqlalchemy import event
+    import database
+    recorded = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+    engines = [database.get_engine(), database.get_async_engine().sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", record)
+
+def populate_events(db, count: int, inactive: int = 0):
+    """Insert `count` active and `inactive` inactive events, each with a source,
+    an update and a tag, using one executemany per table"""
+    from sqlalchemy import insert
+    from database import Article, ArticleTag, Source, Tag, UpdateHistory
+    now = datetime.utcnow()
+    tag_ids = [
+        tag_id for (tag_id,) in db.execute(
+            insert(Tag).returning(Tag.id), [{"name": name} for name in ("Politics", "Technology", "Sports")]
+        )
+    ]
+    db.execute(insert(Article), [
+        {
+            "id": index + 1,
+            "title": f"Event {index}",
+            "description": f"Description of event {index}",
+            "url": f"https://example.com/{index}",
+            "event_id": f"event-{index}",
+            "significance_score": float(index % 100),
+            "base_score": float(index % 100),
+            "is_active": index < count,
+            "created_at": now - timedelta(minutes=index),
+            "latest_update_datetime": now - timedelta(minutes=index),
+            "change_version": 1
+        }
+        for index in range(count + inactive)
+    ])
+    article_ids = range(1, count + inactive + 1)
+    db.execute(insert(Source), [{"article_id": article_id, "name": "BBC", "url": "", "citation": "BBC"} for article_id in article_ids])
+    db.execute(insert(UpdateHistory), [{"article_id": article_id, "date_time": now, "description": "Event created"} for article_id in article_ids])
+    db.execute(insert(ArticleTag), [{"article_id": article_id, "tag_id": tag_ids[article_id % 3]} for article_id in article_ids])
+    db.commit()
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+FEED_URL = "https://feeds.example.com/world.rss"
+
+ARTICLES = [
+    {
+        "title": "Parliament passes the budget",
+        "description": "The budget passed after a late-night vote.",
+        "url": "https://example.com/budget",
+        "source": "Example News",
+        "source_type": "rss",
+        "feed_url": FEED_URL
+    },
+    {
+        "title": "Storm closes the coastal highway",
+        "description": "Crews expect to reopen the road on Friday.",
+        "url": "https://example.com/storm",
+        "source": "Example News",
+        "source_type": "rss",
+        "feed_url": FEED_URL
+    }
+]
+
+@pytest.fixture
+def aggregator(db):
+    from database import FeedSource
+    from news_aggregator import NewsAggregator
+
+    db.add(FeedSource(name="Example News", source_type="rss", url=FEED_URL, is_active=True, etag='"v1"'))
+    db.commit()
+
+    aggregator = NewsAggregator()
+    aggregator.fetches = []
+    def fetch_rss_feed(feed_url, etag=None, last_modified=None):
+        aggregator.fetches.append(etag)
+        # The feed changed since "v1", so the server answers in full
+        return {
+            "feed_url": feed_url,
+            "status": "ok",
+            "articles": [dict(article) for article in ARTICLES],
+            "etag": '"v2"',
+            "last_modified": None
+        }
+    aggregator.fetch_rss_feed = fetch_rss_feed
+    return aggregator
+
+def use_provider(aggregator, failure_rate: float):
+    from llm_providers import FakeProvider, ResilientLLMClient
+    aggregator._llm_client = ResilientLLMClient(FakeProvider(latency=0, failure_rate=failure_rate), max_retries=0)
+
+def make_feed_due(db):
+    from database import FeedSource
+    db.query(FeedSource).update({FeedSource.next_poll_at: datetime.utcnow() - timedelta(minutes=1)})
+    db.commit()
+
+def feed_etag(db):
+    from database import FeedSource
+    db.expire_all()
+    return db.query(FeedSource.etag).scalar()
+
+def seen_count(db):
+    from database import SeenItem
+    return db.query(SeenItem).count()
+
+def test_failed_llm_run_is_retried_in_full(db, aggregator):
+    # The provider is down: the heuristic fallback publishes events, but the
+    # items were never seen by the LLM
+    use_provider(aggregator, failure_rate=1.0)
+    assert aggregator.aggregate_news()["status"] == "completed"
+    assert seen_count(db) == 0
+    assert feed_etag(db) is None
+
+    # The next poll downloads the feed in full and sends both items to the LLM
+    use_provider(aggregator, failure_rate=0.0)
+    make_feed_due(db)
+    assert aggregator.aggregate_news()["status"] == "completed"
+    assert aggregator.fetches == ['"v1"', None]
+    assert seen_count(db) == len(ARTICLES)
+    assert feed_etag(db) == '"v2"'
+
+def test_run_without_events_keeps_nothing(db, aggregator):
+    from database import FeedSource
+
+    use_provider(aggregator, failure_rate=0.0)
+    aggregator.process_with_llm = lambda *args, **kwargs: []
+    make_feed_due(db)
+    next_poll_at = db.query(FeedSource.next_poll_at).scalar()
+
+    assert aggregator.aggregate_news()["status"] == "no_events"
+    db.expire_all()
+    assert db.query(FeedSource.next_poll_at).scalar() == next_poll_at
+    assert seen_count(db) == 0
+    assert feed_etag(db) == '"v1"'
@@ -0,0 +1,83 @@
+import random
+
+import clustering
+from clustering import cluster_articles, jaccard, tokenize
+
+CORPUS = [
+    ("BBC", "Earthquake of magnitude 7.1 strikes off the coast of Japan", "A magnitude 7.1 earthquake struck off the coast of Japan, triggering a tsunami warning."),
+    ("Reuters", "Magnitude 7.1 earthquake strikes off Japan coast, tsunami warning issued", "A strong earthquake struck off the coast of Japan and a tsunami warning was issued."),
+    ("CNN", "Japan: 7.1 magnitude earthquake strikes off coast", "Tsunami warning issued after a magnitude 7.1 earthquake struck off the coast of Japan."),
+    ("BBC", "Central bank raises interest rates by a quarter point", "The central bank raised interest rates by a quarter point to fight inflation."),
+    ("NPR", "Central bank raises interest rates a quarter point to fight inflation", "Interest rates rose by a quarter point as the central bank moved to fight inflation."),
+    ("Guardian", "Champions League final ends in penalty shootout", "The Champions League final was decided by a penalty shootout in Istanbul."),
+    ("BBC", "Wildfires force thousands to evacuate in California", "Thousands of residents were ordered to evacuate as wildfires spread across California."),
+    ("Reuters", "Parliament approves new climate law", "Lawmakers approved a climate law setting emissions targets for 2040.")
+]
+
+def corpus_articles():
+    return [
+        {"title": title, "description": description, "url": f"https://example.com/{index}", "source": source}
+        for index, (source, title, description) in enumerate(CORPUS)
+    ]
+
+def naive_clusters(articles, threshold):
+    """Reference clustering: compare every pair"""
+    token_sets = [tokenize(f"{article['title']} {article['description']}") for article in articles]
+    groups = [{index} for index in range(len(articles))]
+    for left in range(len(articles)):
+        for right in range(left + 1, len(articles)):
+            if jaccard(token_sets[left], token_sets[right]) >= threshold:
+                merged = next(group for group in groups if left in group) | next(group for group in groups if right in group)
+                groups = [group for group in groups if not group & merged] + [merged]
+    return sorted(sorted(group) for group in groups)
+
+def same_cluster_pairs(groups):
+    return {(left, right) for group in groups for left in group for right in group if left < right}
+
+def recall(groups, reference_groups) -> float:
+    """Share of the reference's same-story pairs that `groups` also puts together"""
+    expected = same_cluster_pairs(reference_groups)
+    return len(same_cluster_pairs(groups) & expected) / len(expected)
+
+def generated_articles(stories: int, copies: int):
+    """`copies` rewrites of each story: each drops one of the story's words and adds an outlet's own"""
+    rng = random.Random(0)
+    articles = []
+    for story in range(stories):
+        words = [f"story{story}word{word}" for word in range(12)]
+        for copy in range(copies):
+            dropped = rng.choice(words)
+            text = [word for word in words if word != dropped] + [f"outlet{copy}"]
+            rng.shuffle(text)
+            articles.append({"title": " ".join(text[:6]), "description": " ".join(text[6:]), "url": f"https://example.com/{story}/{copy}"})
+    return articles
+
+def test_near_duplicates_are_merged():
+    articles = corpus_articles()
+    representatives = cluster_articles(articles, threshold=0.3)
+
+    groups = [[articles.index(member) for member in representative["members"]] for representative in representatives]
+    assert groups == [[0, 1, 2], [3, 4], [5], [6], [7]]
+    assert representatives[0]["sources"] == ["BBC", "Reuters", "CNN"]
+    assert representatives[0]["urls"] == [article["url"] for article in articles[:3]]
+    # The member with the longest description stands for the story
+    assert representatives[0]["description"] == max((article["description"] for article in articles[:3]), key=len)
+
+def test_matches_pairwise_clustering_with_far_fewer_comparisons(monkeypatch):
+    articles = generated_articles(stories=150, copies=4)
+    comparisons = []
+    def counting_jaccard(left, right):
+        comparisons.append(1)
+        return jaccard(left, right)
+    monkeypatch.setattr(clustering, "jaccard", counting_jaccard)
+
+    representatives = cluster_articles(articles, threshold=0.5)
+
+    lsh_groups = [[articles.index(member) for member in representative["members"]] for representative in representatives]
+    naive_groups = naive_clusters(articles, threshold=0.5)
+    # Candidates are confirmed with their exact similarity, so LSH never
+    # merges what the pairwise pass keeps apart; it may miss a few pairs
+    assert all(any(set(group) <= set(naive_group) for naive_group in naive_groups) for group in lsh_groups)
+    assert recall(lsh_groups, naive_groups) >= 0.95
+    pairs = len(articles) * (len(articles) - 1) // 2
+    assert len(comparisons) < pairs / 100
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from json_stream import JSONArrayStream, iter_json_array
+
+def chunked(text: str, size: int):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+def parse(text: str, size: int):
+    stream = JSONArrayStream()
+    return list(iter_json_array(chunked(text, size), stream)), stream
+
+# Every chunking must give the same result, down to one character at a time
+CHUNK_SIZES = [1, 7, 1000]
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_strings_with_braces_brackets_and_escaped_quotes(size):
+    events = [
+        {"title": "Talks {stall} over [clause] 4", "description": "He said \"no deal}\" and left ]"},
+        {"title": "Backslash \\ then quote \\\"", "tags": ["a]", "{b"]}
+    ]
+    parsed, stream = parse(json.dumps(events), size)
+    assert parsed == events
+    assert stream.complete
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_malformed_object_in_the_middle_is_skipped(size):
+    text = '[{"title": "first"}, {"title": "broken" "extra": 1}, {"title": "last"}]'
+    parsed, stream = parse(text, size)
+    assert parsed == [{"title": "first"}, {"title": "last"}]
+    assert [bad_text for _, bad_text in stream.malformed] == ['{"title": "broken" "extra": 1}']
+    assert stream.complete
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_truncated_tail_keeps_the_finished_objects(size):
+    text = '[{"title": "first"}, {"title": "second", "sources": ["BBC"]}, {"title": "cut of'
+    parsed, stream = parse(text, size)
+    assert parsed == [{"title": "first"}, {"title": "second", "sources": ["BBC"]}]
+    assert not stream.complete
+    assert stream.malformed == []
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_events_wrapper_object(size):
+    text = '{"events": [{"title": "first"}, {"title": "second"}], "note": [{"title": "ignored"}]}'
+    parsed, stream = parse(text, size)
+    assert parsed == [{"title": "first"}, {"title": "second"}]
+    assert stream.complete
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_prose_and_code_fence_before_the_array(size):
+    text = 'Here are the events you asked for:\n```json\n[{"title": "first"}]\n```\nLet me know!'
+    parsed, stream = parse(text, size)
+    assert parsed == [{"title": "first"}]
+    assert stream.complete
+
+def test_nested_objects_are_yielded_whole():
+    event = {"title": "first", "meta": {"scores": [1, {"deep": "}"}]}}
+    parsed, _ = parse(json.dumps([event, {"title": "second"}]), 3)
+    assert parsed == [event, {"title": "second"}]
@@ -0,0 +1,68 @@
+import pytest
+
+from llm_providers import CircuitBreaker, FakeProvider, LLMProvider, LLMProviderError, ResilientLLMClient
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("llm_providers.time.monotonic", clock)
+    return clock
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+def test_breaker_lets_one_trial_through_when_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+def test_failed_trial_reopens_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 59
+    assert not breaker.allow_request()
+
+def test_open_breaker_skips_the_provider():
+    client = ResilientLLMClient(FakeProvider(latency=0, failure_rate=1.0), max_retries=0,
+                                breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(LLMProviderError, match="failed after 1 attempts"):
+        client.complete("New Articles:")
+    with pytest.raises(LLMProviderError, match="Circuit breaker is open"):
+        client.complete("New Articles:")
+
+def test_provider_must_implement_complete():
+    class Incomplete(LLMProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete("model")
@@ -0,0 +1,51 @@
+import pytest
+
+from news_cache import etag_matches
+
+ETAG = '"3f2a"'
+
+@pytest.mark.parametrize("if_none_match", [
+    '"3f2a"',
+    'W/"3f2a"',
+    '"0000", "3f2a"',
+    '"0000",W/"3f2a"',
+    '*'
+])
+def test_etag_matches(if_none_match):
+    assert etag_matches(if_none_match, ETAG)
+
+@pytest.mark.parametrize("if_none_match", [None, '', '"0000"', '3f2a', '"3f2a', 'W/"0000", "3f2b"'])
+def test_etag_does_not_match(if_none_match):
+    assert not etag_matches(if_none_match, ETAG)
+
+def test_news_endpoint_answers_304_until_the_snapshot_changes(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from conftest import populate_events
+    from database import Article
+    from front_page import write_front_page_snapshot
+    from main import app
+    from news_cache import NewsResponseCache
+
+    # Other tests' snapshots have passed through the shared cache
+    news_cache = NewsResponseCache()
+    monkeypatch.setattr("main.news_cache", news_cache)
+
+    populate_events(db, 3)
+    write_front_page_snapshot(db)
+    db.commit()
+    client = TestClient(app)
+
+    response = client.get("/api/news")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert client.get("/api/news", headers={"If-None-Match": etag}).status_code == 304
+
+    # The aggregator publishes a new snapshot and reports its version
+    db.get(Article, 1).title = "Renamed"
+    news_cache.observe_version(write_front_page_snapshot(db).version)
+    db.commit()
+
+    response = client.get("/api/news", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Renamed" in [article["title"] for article in response.json()["articles"]]
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Response
+from sqlalchemy import select
+
+from conftest import populate_events
+
+# Comparing the paths only means something against PostgreSQL; on SQLite it
+# measures aiosqlite's thread bridge. RUN_LOAD_TESTS=1 runs it anyway.
+pytestmark = pytest.mark.skipif(
+    not os.environ["DB_URL"].startswith("postgresql") and os.getenv("RUN_LOAD_TESTS") != "1",
+    reason="load test needs PostgreSQL (set TEST_DB_URL) or RUN_LOAD_TESTS=1"
+)
+
+CONCURRENCY = int(os.getenv("LOAD_TEST_CONCURRENCY", 100))
+REQUESTS = int(os.getenv("LOAD_TEST_REQUESTS", 1000))
+
+def create_app() -> FastAPI:
+    """/sync and /async serve the front page snapshot without the in-process
+    cache, the way /api/news reads it after each aggregation run"""
+    from database import FRONT_PAGE_SNAPSHOT_ID, FrontPageSnapshot, get_async_db, get_db
+    from front_page import read_front_page_snapshot_async
+    app = FastAPI()
+
+    @app.get("/sync")
+    def read_sync(db=Depends(get_db)):
+        payload = db.scalar(select(FrontPageSnapshot.payload).where(FrontPageSnapshot.id == FRONT_PAGE_SNAPSHOT_ID))
+        return Response(content=payload, media_type="application/json")
+
+    @app.get("/async")
+    async def read_async(db=Depends(get_async_db)):
+        payload = await read_front_page_snapshot_async(db)
+        return Response(content=payload, media_type="application/json")
+
+    return app
+
+def run_load(app: FastAPI, path: str) -> dict:
+    import httpx
+
+    async def run():
+        latencies = []
+        bodies = set()
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            async def request():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    latencies.append(time.perf_counter() - started)
+                    assert response.status_code == 200
+                    bodies.add(response.content)
+            started = time.perf_counter()
+            await asyncio.gather(*(request() for _ in range(REQUESTS)))
+            elapsed = time.perf_counter() - started
+        if path == "/async":
+            from database import get_async_engine
+            await get_async_engine().dispose()
+        latencies.sort()
+        return {
+            "requests_per_second": round(REQUESTS / elapsed, 1),
+            "p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+            "bodies": bodies
+        }
+
+    return asyncio.run(run())
+
+def test_sync_and_async_news_paths_under_load(db):
+    from front_page import write_front_page_snapshot
+
+    populate_events(db, 12)
+    write_front_page_snapshot(db)
+    db.commit()
+    app = create_app()
+
+    sync_results = run_load(app, "/sync")
+    async_results = run_load(app, "/async")
+
+    print(f"\n{REQUESTS} requests, {CONCURRENCY} concurrent")
+    for name, results in (("sync", sync_results), ("async", async_results)):
+        print(f"{name:>5}: {results['requests_per_second']} req/s, p50 {results['p50_ms']} ms, p95 {results['p95_ms']} ms")
+
+    assert len(sync_results["bodies"]) == 1
+    assert sync_results["bodies"] == async_results["bodies"]
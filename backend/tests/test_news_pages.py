@@ -0,0 +1,56 @@
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from front_page import decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(SimpleNamespace(significance_score=87.5, id=42))
+    assert decode_cursor(cursor) == (87.5, 42)
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b"[1]").decode(),
+    base64.urlsafe_b64encode(b'{"score": 1}').decode(),
+    base64.urlsafe_b64encode(b'["high", 3]').decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    "é"
+])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+def test_pages_cover_the_front_page_in_order(db):
+    from fastapi.testclient import TestClient
+    from conftest import populate_events
+    from front_page import build_news_payload
+    from main import app
+
+    # Scores repeat every 100 events, so pages break inside runs of equal scores
+    populate_events(db, 250, inactive=50)
+    expected = [article["eventId"] for article in build_news_payload(db)["articles"]]
+    client = TestClient(app)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 40, "fields": "eventId"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/news", params=params).json()
+        seen.extend(article["eventId"] for article in page["articles"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+def test_bad_cursor_is_a_400(db):
+    from fastapi.testclient import TestClient
+    from main import app
+
+    response = TestClient(app).get("/api/news", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from conftest import populate_events
+
+# One query for the articles plus one per eager-loaded relationship
+# (sources, update history, tags joined with their names)
+NEWS_QUERY_COUNT = 4
+
+@pytest.mark.parametrize("event_count", [12, 1_000, 10_000])
+def test_front_page_query_count_is_flat(db, statements, event_count):
+    from front_page import build_news_payload
+
+    populate_events(db, event_count)
+    statements.clear()
+
+    payload = build_news_payload(db)
+
+    assert len(payload["articles"]) == event_count
+    assert len(statements) == NEWS_QUERY_COUNT
+
+@pytest.mark.parametrize("event_count", [12, 10_000])
+def test_news_page_query_count_is_flat(db, statements, event_count):
+    from database import AsyncSessionLocal
+    from front_page import query_news_page
+
+    populate_events(db, event_count)
+    statements.clear()
+
+    async def load_page():
+        async with AsyncSessionLocal() as session:
+            return await query_news_page(session, limit=50)
+
+    page = asyncio.run(load_page())
+
+    assert len(page["articles"]) == min(event_count, 50)
+    assert len(statements) == NEWS_QUERY_COUNT
@@ -0,0 +1,82 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from conftest import populate_events
+
+# SQLite's EXPLAIN QUERY PLAN is stable enough to assert on; other databases
+# pick plans from their statistics
+pytestmark = pytest.mark.skipif(not os.environ["DB_URL"].startswith("sqlite"), reason="query plans are checked on SQLite")
+
+@pytest.fixture
+def executed():
+    """(statement, parameters) of each query sent through the sync and async engines"""
+    import database
+    recorded = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, parameters))
+    engines = [database.get_engine(), database.get_engine("AGGREGATOR"), database.get_async_engine().sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", record)
+
+def query_plan(db, executed, table: str) -> str:
+    """EXPLAIN QUERY PLAN of the first recorded SELECT from `table`"""
+    statement, parameters = next(
+        (statement, parameters) for statement, parameters in executed
+        if statement.lstrip().startswith("SELECT") and f"FROM {table}" in statement
+    )
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+def load_page(**kwargs):
+    from database import AsyncSessionLocal
+    from front_page import query_news_page
+    async def load():
+        async with AsyncSessionLocal() as session:
+            return await query_news_page(session, **kwargs)
+    return asyncio.run(load())
+
+def test_front_page_reads_the_score_index(db, executed):
+    from front_page import build_news_payload
+
+    populate_events(db, 500, inactive=500)
+    executed.clear()
+    build_news_payload(db)
+
+    plan = query_plan(db, executed, "articles")
+    assert "USING INDEX ix_articles_is_active_significance_score_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_deep_page_is_an_index_range_scan(db, executed):
+    populate_events(db, 500, inactive=500)
+    cursor = load_page(limit=50)["nextCursor"]
+    executed.clear()
+    load_page(limit=50, cursor=cursor)
+
+    plan = query_plan(db, executed, "articles")
+    assert "USING INDEX ix_articles_is_active_significance_score_id (is_active=? AND significance_score<?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_since_filter_reads_the_update_time_index(db, executed):
+    populate_events(db, 500, inactive=500)
+    executed.clear()
+    load_page(limit=50, since=datetime.utcnow() - timedelta(minutes=30))
+
+    plan = query_plan(db, executed, "articles")
+    assert "USING INDEX ix_articles_is_active_latest_update_datetime (is_active=? AND latest_update_datetime>?)" in plan
+
+def test_seen_items_are_looked_up_by_url_hash(db, executed):
+    from seen_items import filter_unseen_articles
+
+    articles = [{"title": f"Story {index}", "description": "", "url": f"https://example.com/{index}"} for index in range(20)]
+    executed.clear()
+    filter_unseen_articles(articles, db)
+
+    plan = query_plan(db, executed, "seen_items")
+    assert "USING INDEX ix_seen_items_url_hash (url_hash=?)" in plan
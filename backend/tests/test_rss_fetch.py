@@ -0,0 +1,73 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Fast News</title>
+<item><title>First story</title><link>https://example.com/first</link><description>One</description></item>
+<item><title>Second story</title><link>https://example.com/second</link><description>Two</description></item>
+</channel></rss>"""
+
+# How long the slow feed takes to answer
+SLOW_SECONDS = 3
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(SLOW_SECONDS)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", '"fast-v1"')
+            self.end_headers()
+            self.wfile.write(FEED)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the slow feed
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def feed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def aggregator():
+    from news_aggregator import NewsAggregator
+    return NewsAggregator()
+
+def fetch(aggregator, feed_server):
+    started = time.monotonic()
+    results = aggregator.fetch_rss_feeds({
+        f"{feed_server}/{name}": {"etag": None, "last_modified": None} for name in ("slow", "fast")
+    })
+    return {result["feed_url"].rsplit("/", 1)[-1]: result for result in results}, time.monotonic() - started
+
+def test_slow_feed_is_cut_off_at_its_read_timeout(aggregator, feed_server):
+    aggregator.rss_read_timeout = 0.5
+
+    results, elapsed = fetch(aggregator, feed_server)
+
+    assert [article["title"] for article in results["fast"]["articles"]] == ["First story", "Second story"]
+    assert results["fast"]["status"] == "ok"
+    assert results["fast"]["etag"] == '"fast-v1"'
+    assert results["slow"]["status"] == "error"
+    assert results["slow"]["articles"] == []
+    assert elapsed < SLOW_SECONDS
+
+def test_slow_feed_is_abandoned_at_the_deadline(aggregator, feed_server):
+    aggregator.rss_fetch_deadline = 0.5
+
+    results, elapsed = fetch(aggregator, feed_server)
+
+    assert list(results) == ["fast"]
+    assert len(results["fast"]["articles"]) == 2
+    assert elapsed < SLOW_SECONDS
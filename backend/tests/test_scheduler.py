@@ -0,0 +1,30 @@
+import threading
+
+def test_scheduler_survives_a_failing_tick():
+    from news_aggregator import NewsAggregator
+
+    aggregator = NewsAggregator()
+    aggregator.leader_heartbeat_seconds = 0.01
+    failures = []
+    is_held = aggregator.leader_lock.is_held
+    def flaky_is_held():
+        if len(failures) < 2:
+            failures.append(1)
+            raise RuntimeError("database is down")
+        return is_held()
+    aggregator.leader_lock.is_held = flaky_is_held
+    submitted = threading.Event()
+    aggregator.jobs.submit = lambda trigger="manual": submitted.set()
+
+    thread = aggregator.start_scheduler()
+    try:
+        # The heartbeat keeps going after the failed ticks and takes the lead
+        assert submitted.wait(5)
+        assert thread.is_alive()
+        assert aggregator.is_leader
+    finally:
+        aggregator.stop_scheduler()
+
+    assert not thread.is_alive()
+    assert not aggregator.is_leader
+    assert not is_held()
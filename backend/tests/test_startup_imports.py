@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+
+# Imported by the first aggregation run that needs them, never at startup
+DEFERRED_MODULES = ["google.generativeai", "openai", "newsapi", "feedparser"]
+
+def test_importing_main_defers_sdks_and_engines():
+    # A fresh interpreter, since this one has already imported the backend
+    script = (
+        "import json, sys\n"
+        "import main, database\n"
+        f"print(json.dumps({{'modules': [name for name in {DEFERRED_MODULES!r} if name in sys.modules], "
+        "'engines': list(database._engines)}))\n"
+    )
+    env = dict(os.environ, LLM_PROVIDER="gemini")
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+    imported = json.loads(output.strip().splitlines()[-1])
+    assert imported == {"modules": [], "engines": []}
@@ -14,7 +14,50 @@ export interface AggregateArticle {
     }[]
     description: string
     tags: string[]
+    significanceScore: number
+    eventId: string
   }
+
+export interface NewsQuery {
+    limit?: number
+    cursor?: string
+    tag?: string
+    minScore?: number
+    since?: string
+    // e.g. ['title', 'tags', 'eventId'] to skip updateHistory and sources
+    fields?: string[]
+  }
+
+export interface NewsPage {
+    articles: Partial<AggregateArticle>[]
+    nextCursor: string | null
+  }
+export interface NewsChanges {
+    version: number
+    // true when `changed` is the whole front page and replaces the client's copy
+    full: boolean
+    changed: Partial<AggregateArticle>[]
+    removed: string[]
+  }
+
+// Apply a /api/news/changes response to the client's copy of the front page.
+// The events must carry eventId and significanceScore, so include both when
+// asking for a subset of fields.
+export function applyNewsChanges(current: Partial<AggregateArticle>[], changes: NewsChanges): Partial<AggregateArticle>[] {
+  const byId = new Map<string, Partial<AggregateArticle>>()
+  if (!changes.full) {
+    for (const article of current) {
+      if (article.eventId) byId.set(article.eventId, article)
+    }
+    for (const eventId of changes.removed) byId.delete(eventId)
+  }
+  for (const article of changes.changed) {
+    if (article.eventId) byId.set(article.eventId, article)
+  }
+  // Same order as /api/news: most significant first
+  return Array.from(byId.values()).sort((a, b) => (b.significanceScore ?? 0) - (a.significanceScore ?? 0))
+}
+
 export class ApiClient {
     private baseUrl: string
   
@@ -53,6 +96,25 @@ export class ApiClient {
       }
     }
 
+    async getNewsPage(query: NewsQuery = {}): Promise<NewsPage> {
+      const params = new URLSearchParams()
+      if (query.limit !== undefined) params.set('limit', String(query.limit))
+      if (query.cursor) params.set('cursor', query.cursor)
+      if (query.tag) params.set('tag', query.tag)
+      if (query.minScore !== undefined) params.set('min_score', String(query.minScore))
+      if (query.since) params.set('since', query.since)
+      if (query.fields) params.set('fields', query.fields.join(','))
+      // Without any parameter the API returns the whole front page instead of a page
+      if (!params.has('limit')) params.set('limit', '20')
+      return this.request<NewsPage>(`/api/news?${params.toString()}`)
+    }
+
+    async getNewsChanges(since: number, fields?: string[]): Promise<NewsChanges> {
+      const params = new URLSearchParams({ since: String(since) })
+      if (fields) params.set('fields', fields.join(','))
+      return this.request<NewsChanges>(`/api/news/changes?${params.toString()}`)
+    }
+
     async triggerAggregation(): Promise<unknown> {
       try {
         const response = await fetch(`${this.baseUrl}/api/aggregate`, {
@@ -70,5 +132,9 @@ export class ApiClient {
         throw error;
       }
     }
+
+    async getAggregationStatus(jobId: string): Promise<unknown> {
+      return this.request(`/api/aggregate/${jobId}`);
+    }
 }
   
\ No newline at end of file